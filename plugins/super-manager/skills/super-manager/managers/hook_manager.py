@@ -15,7 +15,7 @@ import subprocess
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from shared.configuration_paths import (
-    SETTINGS_JSON, HOOK_REGISTRY, HOOKS_DIR, VALID_HOOK_EVENTS, REGISTRIES_DIR,
+    SETTINGS_JSON, HOOK_REGISTRY, HOOKS_DIR, VALID_HOOK_EVENTS,
 )
 from shared.logger import create_logger
 from shared.config_file_handler import read_json, write_json
@@ -118,7 +118,6 @@ def _read_registry():
 
 def _write_registry(hooks_list):
     """Write the registry file atomically. Preserves version field."""
-    os.makedirs(REGISTRIES_DIR, exist_ok=True)
     data = {
         "hooks": [
             {
@@ -149,15 +148,14 @@ def _add_hook_to_settings(event, matcher, command, is_async=False):
     hook_entry = {"type": "command", "command": command}
     if is_async:
         hook_entry["async"] = True
-    for group in matcher_groups:
-        if group.get("matcher", "*") == matcher:
-            existing_commands = [h.get("command", "") for h in group.get("hooks", [])]
-            if command not in existing_commands:
-                group["hooks"].append(hook_entry)
-            write_json(SETTINGS_JSON, settings)
-            return
-    matcher_groups.append({"matcher": matcher, "hooks": [hook_entry]})
-    write_json(SETTINGS_JSON, settings)
+    group = next((g for g in matcher_groups if g.get("matcher", "*") == matcher), None)
+    if group is None:
+        matcher_groups.append({"matcher": matcher, "hooks": [hook_entry]})
+    else:
+        group_hooks = group.setdefault("hooks", [])
+        if not any(h.get("command", "") == command for h in group_hooks):
+            group_hooks.append(hook_entry)
+    write_json(SETTINGS_JSON, settings, durable=True)
 
 
 def _remove_hook_from_settings(command):
@@ -189,7 +187,7 @@ def _remove_hook_from_settings(command):
     for event in events_to_delete:
         del hooks_section[event]
     if removed:
-        write_json(SETTINGS_JSON, settings)
+        write_json(SETTINGS_JSON, settings, durable=True)
     return removed
 
 
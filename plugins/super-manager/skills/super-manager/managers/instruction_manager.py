@@ -18,17 +18,15 @@ Functions are standalone (no class) - matching the pattern of other managers.
 """
 import sys
 import os
-import glob
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from shared.configuration_paths import INSTRUCTIONS_DIR
 from shared.logger import create_logger
-from shared.config_file_handler import read_frontmatter, write_frontmatter
+from shared.config_file_handler import read_frontmatter, write_frontmatter, invalidate_file_cache
 from shared.file_operations import archive_file, ensure_directory
 
 log = create_logger("instruction-manager")
 
-
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
@@ -38,15 +36,38 @@ def _instruction_path(instruction_id):
     return os.path.join(INSTRUCTIONS_DIR, instruction_id + ".md")
 
 
+def invalidate_cache(instruction_id=None):
+    """Drop cached frontmatter for one instruction, or for all files if no ID given."""
+    if instruction_id is None:
+        invalidate_file_cache()
+    else:
+        invalidate_file_cache(_instruction_path(instruction_id))
+
+
+def _list_instruction_files():
+    """
+    List .md files in INSTRUCTIONS_DIR, sorted by name.
+    Single os.scandir pass - file type comes from the directory entry, so no
+    per-file stat is needed to filter out subdirectories.
+    """
+    ensure_directory(INSTRUCTIONS_DIR)
+    with os.scandir(INSTRUCTIONS_DIR) as it:
+        names = [
+            entry.name for entry in it
+            if entry.name.endswith(".md") and not entry.name.startswith(".")
+            and entry.is_file()
+        ]
+    return [os.path.join(INSTRUCTIONS_DIR, name) for name in sorted(names)]
+
+
 def _scan_all():
     """
     Scan INSTRUCTIONS_DIR for .md files and parse frontmatter from each.
     Returns list of (file_path, metadata_dict) tuples.
     Skips files with no valid frontmatter.
     """
-    ensure_directory(INSTRUCTIONS_DIR)
     results = []
-    for md_file in sorted(glob.glob(os.path.join(INSTRUCTIONS_DIR, "*.md"))):
+    for md_file in _list_instruction_files():
         meta = read_frontmatter(md_file)
         if meta is None:
             log.warn("Skipping file with no frontmatter: " + md_file)
@@ -148,6 +169,7 @@ def remove_item(instruction_id):
         }
 
     archive_path = archive_file(file_path, reason="removed")
+    invalidate_cache(instruction_id)
     log.info(
         "remove_item: archived instruction "
         + repr(instruction_id) + " -> " + str(archive_path)
@@ -264,13 +286,12 @@ def verify_all():
     Checks: valid frontmatter, required fields, no duplicate IDs.
     Returns dict with {healthy: [], issues: []}.
     """
-    ensure_directory(INSTRUCTIONS_DIR)
     healthy = []
     issues = []
     seen_ids = {}
     required_fields = ["id", "name", "keywords", "enabled"]
 
-    for md_file in sorted(glob.glob(os.path.join(INSTRUCTIONS_DIR, "*.md"))):
+    for md_file in _list_instruction_files():
         basename = os.path.basename(md_file)
         meta = read_frontmatter(md_file)
 
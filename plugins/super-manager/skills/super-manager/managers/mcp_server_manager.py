@@ -6,16 +6,34 @@ Server lifecycle (start/stop/reload) is handled by mcpm.
 """
 import sys
 import os
-import subprocess
+import functools
+import re
+import shutil
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from shared.configuration_paths import find_servers_yaml, SUPER_MANAGER_DIR
 from shared.logger import create_logger
-from shared.config_file_handler import read_yaml_servers
-from shared.file_operations import archive_file
+from shared.config_file_handler import read_yaml_servers, format_yaml_server, invalidate_file_cache
+from shared.file_operations import archive_file, atomic_write
 
 log = create_logger("mcp-server-manager")
 
+# Line patterns for in-place servers.yaml edits, applied to the raw bytes (re.M).
+# Header: '  <name>:' optionally followed by a YAML anchor ('  name: &anchor').
+_SERVER_HEADER_RE = re.compile(rb"^  ([^\s:#][^\s:]*):[ \t]*(?:&\S+[ \t]*)?\r?$", re.M)
+_ENABLED_RE = re.compile(rb"^[ \t]+enabled:[ \t]*(true|false)\b", re.M)
+# End of a server's settings: next line with content at indent <= 2
+_BLOCK_END_RE = re.compile(rb"^ {0,2}\S", re.M)
+# Run of blank lines ending at the search's endpos (blank lines *inside* a
+# multi-line value are followed by content, so they never match)
+_BLANK_RUN_RE = re.compile(rb"(?:^[ \t]*\r?\n)+\Z", re.M)
+
+
+@functools.lru_cache(maxsize=None)
+def _which(cmd):
+    """shutil.which() memoized per command - servers often share npx/python/node."""
+    return shutil.which(cmd)
+
 
 def list_all():
     """List all MCP servers from servers.yaml."""
@@ -47,37 +65,120 @@ def list_all():
 
 def add_item(name, command="", description="", args=None, tags=None, enabled=False):
     """Add a server to servers.yaml."""
+    return add_items([{
+        "name": name,
+        "command": command,
+        "description": description,
+        "args": args,
+        "tags": tags,
+        "enabled": enabled,
+    }])
+
+
+def _entry_block(name, command, description="", args=None, tags=None, enabled=False):
+    """servers.yaml text for one new server block (leading blank separator included)."""
+    entry = {"description": description, "command": command}
+    if args:
+        entry["args"] = [str(a) for a in args]
+    if tags:
+        entry["tags"] = [str(t) for t in tags]
+    entry["enabled"] = bool(enabled)
+    return "\n" + format_yaml_server(name, entry)
+
+
+def add_items(entries):
+    """
+    Add several servers to servers.yaml with a single append.
+    Each entry is a dict with add_item's keyword arguments (name and command required).
+    All entries are validated first; nothing is written if any is rejected.
+    """
     yaml_path = find_servers_yaml()
     if not yaml_path:
         return {"success": False, "message": "servers.yaml not found"}
 
-    if not command:
-        return {"success": False, "message": "command is required"}
-
     servers = read_yaml_servers(yaml_path)
-    if name in servers:
-        return {"success": False, "message": "Server '{}' already exists".format(name)}
-
-    # Append to servers.yaml
-    entry_lines = [
-        "",
-        "  {}:".format(name),
-        '    description: "{}"'.format(description),
-        '    command: "{}"'.format(command),
-    ]
-    if args:
-        args_str = ", ".join('"{}"'.format(a) for a in args)
-        entry_lines.append("    args: [{}]".format(args_str))
-    if tags:
-        tags_str = ", ".join('"{}"'.format(t) for t in tags)
-        entry_lines.append("    tags: [{}]".format(tags_str))
-    entry_lines.append("    enabled: {}".format("true" if enabled else "false"))
-
-    with open(yaml_path, "a", encoding="utf-8") as f:
-        f.write("\n".join(entry_lines) + "\n")
-
-    log.info("ADD: {} -> {}".format(name, command))
-    return {"success": True, "message": "Added server '{}'".format(name)}
+    seen = set()
+    blocks = []
+    for entry in entries:
+        name = entry.get("name") or ""
+        command = entry.get("command", "")
+        if not name.strip():
+            return {"success": False, "message": "name is required"}
+        if not command:
+            return {"success": False, "message": "command is required"}
+        if name in servers or name in seen:
+            return {"success": False, "message": "Server '{}' already exists".format(name)}
+        seen.add(name)
+        blocks.append(_entry_block(
+            name,
+            command,
+            description=entry.get("description", ""),
+            args=entry.get("args"),
+            tags=entry.get("tags"),
+            enabled=entry.get("enabled", False),
+        ))
+
+    if not blocks:
+        return {"success": True, "message": "No servers to add"}
+
+    with open(yaml_path, "rb") as f:
+        data = f.read()
+    # New blocks follow the file's line endings (the bundled servers.yaml is CRLF);
+    # values never hold a raw newline, format_yaml_server escapes them
+    newline = b"\r\n" if b"\r\n" in data else b"\n"
+    block = "".join(blocks).encode("utf-8").replace(b"\n", newline)
+    insert_at = _servers_section_end(data)
+    if insert_at is None:
+        # servers: is the last top-level key - one buffered append for the whole
+        # batch, flushed and fsynced once at the end
+        with open(yaml_path, "ab", buffering=1 << 16) as f:
+            f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+    else:
+        # Another top-level key (e.g. defaults:) follows; keep the new blocks under servers:
+        atomic_write(yaml_path, data[:insert_at] + block[len(newline):] + newline + data[insert_at:],
+                     durable=True)
+    invalidate_file_cache(yaml_path)
+
+    for entry in entries:
+        log.info("ADD: {} -> {}".format(entry["name"], entry["command"]))
+    if len(entries) == 1:
+        return {"success": True, "message": "Added server '{}'".format(entries[0]["name"])}
+    return {"success": True, "message": "Added {} servers".format(len(entries))}
+
+
+def _servers_section_end(data):
+    """
+    Offset of the first top-level key after 'servers:' in servers.yaml bytes.
+    Returns None when the servers section runs to end of file.
+    """
+    if data.startswith(b"servers:"):
+        pos = 0
+    else:
+        pos = data.find(b"\nservers:")
+        if pos == -1:
+            return None
+    pos = data.find(b"\n", pos + 1)
+    while pos != -1:
+        line_start = pos + 1
+        first = data[line_start:line_start + 1]
+        if first and first not in b" \t\r\n#":
+            return line_start
+        pos = data.find(b"\n", line_start)
+    return None
+
+
+def _find_server_header(data, name):
+    """
+    Locate the '  <name>:' header line in servers.yaml bytes.
+    Returns (line_start, next_line_start) or None.
+    """
+    target = name.encode("utf-8")
+    for m in _SERVER_HEADER_RE.finditer(data):
+        if m.group(1) == target:
+            return m.start(), min(m.end() + 1, len(data))
+    return None
 
 
 def remove_item(name):
@@ -86,38 +187,27 @@ def remove_item(name):
     if not yaml_path:
         return {"success": False, "message": "servers.yaml not found"}
 
-    with open(yaml_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    new_lines = []
-    skip = False
-    found = False
-    for line in lines:
-        stripped = line.strip()
-        indent = len(line) - len(line.lstrip())
-
-        if indent == 2 and stripped.endswith(":") and not stripped.startswith("#"):
-            server_name = stripped[:-1].strip()
-            if server_name == name:
-                skip = True
-                found = True
-                continue
-            else:
-                skip = False
-
-        if skip and indent > 2:
-            continue
-        elif skip and indent <= 2:
-            skip = False
-
-        if not skip:
-            new_lines.append(line)
+    with open(yaml_path, "rb") as f:
+        data = f.read()
 
-    if not found:
+    header = _find_server_header(data, name)
+    if header is None:
         return {"success": False, "message": "Server '{}' not found".format(name)}
 
-    with open(yaml_path, "w", encoding="utf-8") as f:
-        f.writelines(new_lines)
+    block_start, pos = header
+    stop = _BLOCK_END_RE.search(data, pos)
+    block_end = stop.start() if stop else len(data)
+    # Take the separator above the block (the one add_items writes) if there is one,
+    # otherwise the one below, so exactly one survives between the neighbours
+    above = _BLANK_RUN_RE.search(data, 0, block_start)
+    if above:
+        block_start = above.start()
+        below = _BLANK_RUN_RE.search(data, pos, block_end)
+        if below:
+            block_end = below.start()
+
+    atomic_write(yaml_path, data[:block_start] + data[block_end:], durable=True)
+    invalidate_file_cache(yaml_path)
 
     log.info("REMOVE: {}".format(name))
     return {"success": True, "message": "Removed server '{}' from servers.yaml".format(name)}
@@ -141,39 +231,28 @@ def disable_item(name):
 
 def _set_enabled(yaml_path, name, enabled):
     """Toggle enabled flag for a server in servers.yaml (in-place edit)."""
-    with open(yaml_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    found_server = False
-    in_target = False
-    modified = False
+    with open(yaml_path, "rb") as f:
+        data = f.read()
 
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        indent = len(line) - len(line.lstrip())
-
-        if indent == 2 and stripped.endswith(":") and " " not in stripped:
-            server_name = stripped[:-1]
-            in_target = (server_name == name)
-            if in_target:
-                found_server = True
-            continue
-
-        if in_target and stripped.startswith("enabled:"):
-            old_value = "true" if "true" in stripped else "false"
-            new_value = "true" if enabled else "false"
-            if old_value != new_value:
-                lines[i] = line.replace("enabled: {}".format(old_value), "enabled: {}".format(new_value))
-                modified = True
-            break
-
-    if not found_server:
+    header = _find_server_header(data, name)
+    if header is None:
         log.error("ENABLE/DISABLE: server '{}' not found in servers.yaml".format(name))
         return {"success": False, "message": "Server '{}' not found".format(name)}
 
+    # Only the target block is searched for its enabled: line
+    pos = header[1]
+    stop = _BLOCK_END_RE.search(data, pos)
+    block_end = stop.start() if stop else len(data)
+    modified = False
+    m = _ENABLED_RE.search(data, pos, block_end)
+    new_value = b"true" if enabled else b"false"
+    if m and m.group(1) != new_value:
+        data = data[:m.start(1)] + new_value + data[m.end(1):]
+        modified = True
+
     if modified:
-        with open(yaml_path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
+        atomic_write(yaml_path, data, durable=True)
+        invalidate_file_cache(yaml_path)
         action = "ENABLE" if enabled else "DISABLE"
         log.info("{}: {}".format(action, name))
         return {"success": True, "message": "Server '{}' {}".format(name, "enabled" if enabled else "disabled")}
@@ -197,18 +276,12 @@ def verify_all(name=None):
 
         if config.get("enabled") and config.get("command"):
             cmd = config["command"]
-            try:
-                result = subprocess.run(
-                    ["which", cmd], capture_output=True, text=True, timeout=5
-                )
-                if result.returncode != 0:
-                    issues.append({
-                        "item": srv_name,
-                        "problem": "command '{}' not found on PATH".format(cmd),
-                        "fix": "Check binary installation",
-                    })
-            except Exception:
-                pass
+            if _which(cmd) is None:
+                issues.append({
+                    "item": srv_name,
+                    "problem": "command '{}' not found on PATH".format(cmd),
+                    "fix": "Check binary installation",
+                })
 
         if not config.get("command") and not config.get("url"):
             issues.append({
@@ -217,6 +290,7 @@ def verify_all(name=None):
                 "fix": "Add command to servers.yaml",
             })
 
-    healthy_list = [s for s in servers.keys() if not any(i.get("item") == s for i in issues)]
+    problem_items = {i["item"] for i in issues}
+    healthy_list = [s for s in servers if s not in problem_items]
     log.info("VERIFY: {} servers checked, {} issues".format(len(servers), len(issues)))
     return {"healthy": healthy_list, "issues": issues}
@@ -9,9 +9,10 @@ Skills directory:  ~/.claude/skills/ (each skill is a folder with SKILL.md)
 """
 import sys
 import os
+from collections import Counter
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from shared.configuration_paths import SKILL_REGISTRY, GLOBAL_SKILLS_DIR, REGISTRIES_DIR
+from shared.configuration_paths import SKILL_REGISTRY, GLOBAL_SKILLS_DIR
 from shared.logger import create_logger
 from shared.config_file_handler import read_json, write_json
 
@@ -30,20 +31,18 @@ def _read_registry():
 
 def _write_registry(skills_list):
     """Write the registry file atomically."""
-    os.makedirs(REGISTRIES_DIR, exist_ok=True)
-    data = {
-        "skills": [
-            {
-                "id": s.get("id", s.get("name", "")),
-                "name": s.get("name", s.get("id", "")),
-                "keywords": s.get("keywords", []),
-                "skillPath": s.get("skillPath", ""),
-                "enabled": s.get("enabled", True),
-            }
-            for s in skills_list
-        ],
-    }
-    write_json(SKILL_REGISTRY, data)
+    out = [None] * len(skills_list)
+    for i, s in enumerate(skills_list):
+        # One lookup each for id/name in the common case where both are set
+        sid = s.get("id") or s.get("name") or ""
+        out[i] = {
+            "id": sid,
+            "name": s.get("name") or sid,
+            "keywords": s.get("keywords", []),
+            "skillPath": s.get("skillPath", ""),
+            "enabled": s.get("enabled", True),
+        }
+    write_json(SKILL_REGISTRY, {"skills": out})
 
 
 def _find_registry_entry(name, skills_list):
@@ -60,15 +59,18 @@ def _scan_disk_skills():
     Returns dict: {skill_dir_name: absolute_path_to_SKILL.md}
     """
     results = {}
-    if not os.path.isdir(GLOBAL_SKILLS_DIR):
+    try:
+        it = os.scandir(GLOBAL_SKILLS_DIR)
+    except (FileNotFoundError, NotADirectoryError):
         return results
-    for entry in os.listdir(GLOBAL_SKILLS_DIR):
-        skill_dir = os.path.join(GLOBAL_SKILLS_DIR, entry)
-        if not os.path.isdir(skill_dir):
-            continue
-        skill_md = os.path.join(skill_dir, "SKILL.md")
-        if os.path.isfile(skill_md):
-            results[entry] = skill_md
+    with it:
+        for entry in it:
+            # DirEntry caches the file type from readdir; symlinked skill dirs still count
+            if not entry.is_dir():
+                continue
+            skill_md = os.path.join(entry.path, "SKILL.md")
+            if os.path.isfile(skill_md):
+                results[entry.name] = skill_md
     return results
 
 
@@ -140,7 +142,6 @@ def list_all():
     for dir_name, skill_md_path in disk_skills.items():
         if dir_name in seen_names:
             continue
-        seen_names.add(dir_name)
         items.append({
             "name": dir_name,
             "id": dir_name,
@@ -153,10 +154,11 @@ def list_all():
         })
 
     total = len(items)
-    healthy = sum(1 for i in items if i["status"] == "healthy")
-    disabled = sum(1 for i in items if i["status"] == "disabled")
-    orphaned_reg = sum(1 for i in items if i["status"] == "orphaned-registry")
-    orphaned_disk = sum(1 for i in items if i["status"] == "orphaned-disk")
+    counts = Counter(i["status"] for i in items)
+    healthy = counts["healthy"]
+    disabled = counts["disabled"]
+    orphaned_reg = counts["orphaned-registry"]
+    orphaned_disk = counts["orphaned-disk"]
 
     parts = ["{} skills".format(total)]
     if healthy:
@@ -228,6 +230,7 @@ def remove_item(name):
         log.error("remove_item: {}".format(msg))
         return {"success": False, "message": msg}
 
+    # Drops every entry with this id/name, duplicates included
     registry_skills = [
         s for s in registry_skills
         if s.get("id") != name and s.get("name") != name
@@ -299,6 +302,8 @@ def verify_all():
     healthy = []
     issues = []
     seen_on_disk = set()
+    # SKILL.md path -> disk dir name, for registry entries whose id differs from their folder
+    disk_by_path = {os.path.normpath(p): n for n, p in disk_skills.items()}
 
     for rs in registry_skills:
         skill_id = rs.get("id", rs.get("name", ""))
@@ -312,10 +317,9 @@ def verify_all():
             seen_on_disk.add(skill_id)
         elif skill_path and os.path.isfile(skill_path):
             on_disk = True
-            for dk in disk_skills:
-                if disk_skills[dk] == os.path.normpath(skill_path):
-                    seen_on_disk.add(dk)
-                    break
+            hit = disk_by_path.get(os.path.normpath(skill_path))
+            if hit:
+                seen_on_disk.add(hit)
 
         if on_disk and enabled:
             healthy.append(skill_name)
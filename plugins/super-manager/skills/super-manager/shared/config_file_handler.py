@@ -3,11 +3,61 @@ config_file_handler.py - Read and write JSON registries, YAML configs, and markd
 
 Handles the 3 config file formats used by super-manager:
   - JSON: hook-registry.json, skill-registry.json, settings.json
-  - YAML: servers.yaml (simple parser, no PyYAML dependency)
+  - YAML: servers.yaml (PyYAML's libyaml loader when installed, else a simple line parser)
   - Markdown frontmatter: instruction .md files (--- delimited YAML header)
 """
+import copy
 import json
+import mmap
 import os
+import re
+
+from shared.file_operations import atomic_write
+
+# orjson is optional - a faster drop-in for json.loads/dumps when installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# PyYAML is optional. Prefer the libyaml-backed C loader/dumper; without PyYAML,
+# read_yaml_servers falls back to the line parser below.
+try:
+    import yaml
+    try:
+        from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+    class _ServerDumper(_YamlDumper):
+        """Dumper for servers.yaml blocks: strings with line breaks get double quotes."""
+
+    def _represent_str(dumper, value):
+        # A plain/single-quoted scalar would spill onto continuation lines (blank ones
+        # included); double quotes escape the breaks as \n and keep one line per key
+        style = '"' if _LINE_BREAK_RE.search(value) else None
+        return dumper.represent_scalar("tag:yaml.org,2002:str", value, style=style)
+
+    _ServerDumper.add_representer(str, _represent_str)
+except ImportError:
+    yaml = None
+
+# Characters YAML treats as line breaks inside a scalar
+_LINE_BREAK_RE = re.compile("[\r\n\x85\u2028\u2029]")
+
+
+# Files at least this large are parsed straight from a read-only mapping
+_MMAP_THRESHOLD = 64 * 1024
+
+
+def _json_loads(buf):
+    """Parse JSON bytes (or a memoryview) with orjson when available, else the stdlib."""
+    if orjson is not None:
+        try:
+            return orjson.loads(buf)
+        except orjson.JSONDecodeError:
+            pass  # stdlib also accepts NaN, big ints, BOMs - let it decide
+    return json.loads(bytes(buf))
 
 
 def read_json(file_path, default=None):
@@ -15,62 +65,192 @@ def read_json(file_path, default=None):
     if default is None:
         default = {}
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+                return _json_loads(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return _json_loads(view)
+    except (FileNotFoundError, ValueError):
         return default
 
 
-def write_json(file_path, data):
-    """Write JSON atomically (temp file then rename)."""
-    tmp_path = file_path + ".tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-    os.replace(tmp_path, file_path)
+def _json_dumps(data):
+    """Serialize to indented UTF-8 JSON bytes with a trailing newline."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            pass  # non-str keys, >64-bit ints - the stdlib handles those
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def write_json(file_path, data, durable=False):
+    """Write JSON atomically (temp file then rename). durable=True fsyncs, see atomic_write."""
+    atomic_write(file_path, _json_dumps(data), durable=durable)
+
+
+# Parsed YAML/frontmatter per path: {file_path: ((st_mtime_ns, st_size), parsed)}.
+# A changed stamp means a re-parse; the stale entry is overwritten.
+_PARSE_CACHE = {}
+
+
+def _file_stamp(file_path):
+    st = os.stat(file_path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def invalidate_file_cache(file_path=None):
+    """Drop the cached parse for one file, or for every file if no path given."""
+    if file_path is None:
+        _PARSE_CACHE.clear()
+    else:
+        _PARSE_CACHE.pop(file_path, None)
 
 
 def _strip_yaml_quotes(value):
-    """Strip surrounding quotes from a YAML value."""
+    """Strip surrounding quotes from a YAML value (decoding \\-escapes in double quotes)."""
     if len(value) >= 2:
-        if (value[0] == '"' and value[-1] == '"') or (value[0] == "'" and value[-1] == "'"):
+        if value[0] == '"' and value[-1] == '"':
+            try:
+                return json.loads(value)
+            except ValueError:
+                return value[1:-1]
+        if value[0] == "'" and value[-1] == "'":
             return value[1:-1]
     return value
 
 
+def _new_server_entry():
+    """Default shape of a parsed server config."""
+    return {
+        "description": "",
+        "enabled": False,
+        "auto_start": False,
+        "command": "",
+        "args": [],
+        "tags": [],
+        "keywords": [],
+        "url": "",
+    }
+
+
+def _yaml_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() == "true"
+
+
+def _yaml_int(value, default):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    value = str(value)
+    return int(value) if value.isdigit() else default
+
+
+def _servers_from_yaml(data):
+    """Normalize a PyYAML document into the same shape _parse_servers_lines returns."""
+    section = data.get("servers") if isinstance(data, dict) else None
+    if not isinstance(section, dict):
+        return {}
+    servers = {}
+    for name, cfg in section.items():
+        entry = _new_server_entry()
+        if isinstance(cfg, dict):
+            for key, value in cfg.items():
+                if value is None:
+                    continue
+                if key in ("tags", "args", "keywords"):
+                    if not isinstance(value, list):
+                        value = [value]
+                    entry[key] = [str(v) for v in value]
+                elif key in ("enabled", "auto_start"):
+                    entry[key] = _yaml_bool(value)
+                elif key in ("description", "command", "url"):
+                    entry[key] = str(value)
+                elif key == "idle_timeout":
+                    entry[key] = _yaml_int(value, 300000)
+                elif key == "startup_delay":
+                    entry[key] = _yaml_int(value, 3000)
+        servers[str(name)] = entry
+    return servers
+
+
 def read_yaml_servers(file_path):
     """
     Parse servers.yaml into a dict of server configs.
-    Simple line-by-line parser - handles the specific format used by mcp-manager.
+    Uses PyYAML (C loader when available); falls back to the line parser if
+    PyYAML is not installed or the file is not valid YAML.
     Returns: {"server-name": {"description": "...", "enabled": True, "tags": [...], ...}, ...}
+    Parses are cached on (mtime, size); each call gets a deep copy, so callers
+    may mutate the result freely.
     """
-    if not os.path.exists(file_path):
+    try:
+        stamp = _file_stamp(file_path)
+    except FileNotFoundError:
+        _PARSE_CACHE.pop(file_path, None)
         return {}
+    cached = _PARSE_CACHE.get(file_path)
+    if cached is None or cached[0] != stamp:
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        servers = None
+        if yaml is not None:
+            try:
+                # libyaml decodes the UTF-8 bytes itself
+                servers = _servers_from_yaml(yaml.load(raw, Loader=_YamlLoader))
+            except yaml.YAMLError:
+                pass
+        if servers is None:
+            servers = _parse_servers_lines(raw.decode("utf-8"))
+        cached = (stamp, servers)
+        _PARSE_CACHE[file_path] = cached
+    return copy.deepcopy(cached[1])
+
+
+def format_yaml_server(name, entry):
+    """
+    Serialize one server config as a servers.yaml block, indented to sit under 'servers:'.
+    Uses PyYAML's safe dumper when installed, double-quoting any string with a line
+    break; otherwise JSON-quotes every string (a JSON string is a valid YAML
+    double-quoted scalar). Either way each key is written on a single line.
+    """
+    if yaml is not None:
+        text = yaml.dump(
+            {name: entry}, Dumper=_ServerDumper, default_flow_style=False,
+            sort_keys=False, indent=2, width=1 << 16, allow_unicode=True,
+        )
+    else:
+        lines = ["{}:".format(name)]
+        for key, value in entry.items():
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            elif isinstance(value, list):
+                value = "[{}]".format(", ".join(json.dumps(str(v), ensure_ascii=False) for v in value))
+            else:
+                value = json.dumps(str(value), ensure_ascii=False)
+            lines.append("  {}: {}".format(key, value))
+        text = "\n".join(lines) + "\n"
+    return "".join("  " + line for line in text.splitlines(True))
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
 
+def _parse_servers_lines(content):
+    """
+    Simple line-by-line parser - handles the specific format used by mcp-manager.
+    Fallback for read_yaml_servers when PyYAML is unavailable.
+    """
     servers = {}
     current = None
     current_list_key = None  # tracks which list we're inside (tags, args, keywords)
 
-    for line in content.split("\n"):
+    for line in content.splitlines():
         stripped = line.strip()
         indent = len(line) - len(line.lstrip())
 
         # Top-level server name (indent=2, ends with colon, no spaces in name)
         if indent == 2 and stripped.endswith(":") and " " not in stripped:
             current = stripped[:-1]
-            servers[current] = {
-                "description": "",
-                "enabled": False,
-                "auto_start": False,
-                "command": "",
-                "args": [],
-                "tags": [],
-                "keywords": [],
-                "url": "",
-            }
+            servers[current] = _new_server_entry()
             current_list_key = None
             continue
 
@@ -84,9 +264,10 @@ def read_yaml_servers(file_path):
             continue
 
         # Key: value pair
-        if ":" in stripped and not stripped.startswith("-"):
-            key = stripped.split(":")[0].strip()
-            value = ":".join(stripped.split(":")[1:]).strip()
+        colon = stripped.find(":")
+        if colon != -1 and not stripped.startswith("-"):
+            key = stripped[:colon].strip()
+            value = stripped[colon + 1:].strip()
             current_list_key = None
 
             if key in ("tags", "args", "keywords"):
@@ -109,26 +290,28 @@ def read_yaml_servers(file_path):
     return servers
 
 
-def read_frontmatter(file_path):
-    """
-    Read a markdown file with YAML frontmatter.
-    Returns: {"id": "...", "keywords": [...], "tools": [...], "description": "...", "body": "..."}
-    Returns None if file doesn't exist or has no frontmatter.
-    """
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-    except FileNotFoundError:
-        return None
+# Leading '---', header up to the next '---', then the body - one C-level match on bytes
+_FM_RE = re.compile(rb"---(.*?)---(.*)", re.DOTALL)
+
+
+def _decode_text(raw):
+    """UTF-8 decode with the newline translation a text-mode open() would apply."""
+    text = raw.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
-    if not content.startswith("---"):
-        return None
 
-    end_idx = content.index("---", 3) if "---" in content[3:] else -1
-    if end_idx == -1:
+def _parse_frontmatter(raw):
+    """
+    Split '---' delimited frontmatter bytes into a meta dict (plus "body"), or None.
+    Delimiters are found on the raw bytes; files without frontmatter are never decoded.
+    """
+    m = _FM_RE.match(raw)
+    if m is None:
         return None
 
-    yaml_block = content[3:end_idx].strip()
+    yaml_block = _decode_text(m.group(1)).strip()
     meta = {}
 
     for line in yaml_block.split("\n"):
@@ -143,10 +326,40 @@ def read_frontmatter(file_path):
         else:
             meta[key] = value
 
-    meta["body"] = content[end_idx + 3:].strip()
+    meta["body"] = _decode_text(m.group(2)).strip()
     return meta
 
 
+def _copy_meta(meta):
+    if meta is None:
+        return None
+    return {k: list(v) if isinstance(v, list) else v for k, v in meta.items()}
+
+
+def read_frontmatter(file_path):
+    """
+    Read a markdown file with YAML frontmatter.
+    Returns: {"id": "...", "keywords": [...], "tools": [...], "description": "...", "body": "..."}
+    Returns None if file doesn't exist or has no frontmatter.
+    Parses are cached on (mtime, size); callers get their own copy to mutate.
+    """
+    try:
+        stamp = _file_stamp(file_path)
+    except FileNotFoundError:
+        _PARSE_CACHE.pop(file_path, None)
+        return None
+    cached = _PARSE_CACHE.get(file_path)
+    if cached is None or cached[0] != stamp:
+        try:
+            with open(file_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        cached = (stamp, _parse_frontmatter(raw))
+        _PARSE_CACHE[file_path] = cached
+    return _copy_meta(cached[1])
+
+
 def write_frontmatter(file_path, meta, body):
     """Write a markdown file with YAML frontmatter."""
     lines = ["---"]
@@ -160,9 +373,7 @@ def write_frontmatter(file_path, meta, body):
     lines.append("---")
     lines.append("")
     lines.append(body)
-    content = "\n".join(lines) + "\n"
-
-    tmp_path = file_path + ".tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        f.write(content)
-    os.replace(tmp_path, file_path)
+    raw = ("\n".join(lines) + "\n").encode("utf-8")
+    atomic_write(file_path, raw)
+    # Seed the cache with exactly what a re-read would parse, so it costs no I/O
+    _PARSE_CACHE[file_path] = (_file_stamp(file_path), _parse_frontmatter(raw))
@@ -76,14 +76,38 @@ VALID_HOOK_EVENTS = [
     "Stop", "SubAgentSop", "PermissionRequest",
 ]
 
+_servers_yaml_path = None
+
+
 def find_servers_yaml():
-    """Find the first existing servers.yaml path."""
+    """
+    Find the first existing servers.yaml path.
+    The hit is remembered and only re-checked with one stat on later calls;
+    refresh_servers_yaml() forces a full re-probe.
+    """
+    global _servers_yaml_path
+    if _servers_yaml_path is not None:
+        try:
+            os.stat(_servers_yaml_path)
+            return _servers_yaml_path
+        except OSError:
+            _servers_yaml_path = None
     for path in MCP_SERVERS_YAML_PATHS:
-        if os.path.exists(path):
-            return path
+        try:
+            os.stat(path)
+        except OSError:
+            continue
+        _servers_yaml_path = path
+        return path
     return None
 
 
+def refresh_servers_yaml():
+    """Forget the remembered servers.yaml location."""
+    global _servers_yaml_path
+    _servers_yaml_path = None
+
+
 def _discover_env_files():
     """Discover .env files in MCP server directories dynamically."""
     env_files = []
@@ -2,16 +2,25 @@
 file_operations.py - Archive-not-delete and atomic write operations.
 
 NEVER deletes files. Always moves to ~/.claude/super-manager/archive/ with a timestamp.
-Atomic writes use temp-file-then-rename to prevent corruption.
+Atomic writes use temp-file-then-rename to prevent corruption (plus fsync when durable=True).
 """
 import os
 import shutil
-import datetime
-from shared.configuration_paths import ARCHIVE_DIR
+import time
+from shared.configuration_paths import ARCHIVE_DIR, REGISTRIES_DIR
 
 
-def _ensure_archive_dir():
-    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+# Created once at import so archiving and registry writes never pay for a mkdir
+os.makedirs(ARCHIVE_DIR, exist_ok=True)
+os.makedirs(REGISTRIES_DIR, exist_ok=True)
+
+
+def _move(source_path, archive_path):
+    """Same-volume rename (the common case), shutil.move across filesystems."""
+    try:
+        os.rename(source_path, archive_path)
+    except OSError:
+        shutil.move(source_path, archive_path)
 
 
 def archive_file(source_path, reason=""):
@@ -22,14 +31,13 @@ def archive_file(source_path, reason=""):
     """
     if not os.path.exists(source_path):
         return None
-    _ensure_archive_dir()
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     basename = os.path.basename(source_path)
     archive_name = f"{basename}_{timestamp}"
     if reason:
         archive_name += f"_{reason}"
     archive_path = os.path.join(ARCHIVE_DIR, archive_name)
-    shutil.move(source_path, archive_path)
+    _move(source_path, archive_path)
     return archive_path
 
 
@@ -37,24 +45,50 @@ def archive_directory(source_path, reason=""):
     """Move a directory to the archive with a timestamp suffix."""
     if not os.path.exists(source_path):
         return None
-    _ensure_archive_dir()
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     basename = os.path.basename(source_path)
     archive_name = f"{basename}_{timestamp}"
     if reason:
         archive_name += f"_{reason}"
     archive_path = os.path.join(ARCHIVE_DIR, archive_name)
-    shutil.move(source_path, archive_path)
+    _move(source_path, archive_path)
     return archive_path
 
 
-def atomic_write(file_path, content):
-    """Write content to file atomically (write to .tmp, then rename)."""
+def atomic_write(file_path, content, durable=False):
+    """
+    Write content (str or bytes) to file atomically: one os.write to .tmp, then rename.
+    str content is encoded as UTF-8.
+    durable=True also fsyncs the temp file and the parent directory so the new
+    contents survive a power loss - use it for files that must never roll back
+    (Claude Code settings, servers.yaml). Registries, instructions and reports
+    are cheap to regenerate and skip the sync.
+    """
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if isinstance(content, str):
+        content = content.encode("utf-8")
     tmp_path = file_path + ".tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        os.write(fd, content)
+        if durable:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
     os.replace(tmp_path, file_path)
+    if durable:
+        _fsync_dir(os.path.dirname(file_path))
+
+
+def _fsync_dir(dir_path):
+    """Persist a rename by fsyncing its directory (POSIX only - Windows has no directory fds)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 def ensure_directory(dir_path):
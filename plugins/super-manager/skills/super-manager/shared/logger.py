@@ -11,24 +11,20 @@ Usage:
     log.error("File not found: path/to/hook.js")
 """
 import os
-import datetime
+import atexit
+import time
 from shared.configuration_paths import LOGS_DIR
 
 MAX_LOG_SIZE = 1_000_000  # 1MB
 MAX_ROTATIONS = 3
 
 
-def _ensure_logs_dir():
-    os.makedirs(LOGS_DIR, exist_ok=True)
+# Created once at import; Logger instances never mkdir on their own
+os.makedirs(LOGS_DIR, exist_ok=True)
 
 
-def _rotate_if_needed(log_path):
-    """Rotate log file if it exceeds MAX_LOG_SIZE."""
-    if not os.path.exists(log_path):
-        return
-    if os.path.getsize(log_path) < MAX_LOG_SIZE:
-        return
-    # Rotate: .log.3 -> delete, .log.2 -> .log.3, .log.1 -> .log.2, .log -> .log.1
+def _rotate_files(log_path):
+    """Shift the log down one slot: .log.3 -> delete, .log.2 -> .log.3, .log.1 -> .log.2, .log -> .log.1"""
     for i in range(MAX_ROTATIONS, 0, -1):
         old = f"{log_path}.{i}"
         new = f"{log_path}.{i + 1}" if i < MAX_ROTATIONS else None
@@ -37,33 +33,64 @@ def _rotate_if_needed(log_path):
                 os.replace(old, new)
             else:
                 os.remove(old)
-    os.replace(log_path, f"{log_path}.1")
+    try:
+        os.replace(log_path, f"{log_path}.1")
+    except FileNotFoundError:
+        pass  # another process rotated it first
 
 
 class Logger:
     def __init__(self, manager_name):
         self.manager_name = manager_name
         self.log_path = os.path.join(LOGS_DIR, f"{manager_name}.log")
-        _ensure_logs_dir()
+        self._name_b = manager_name.encode("utf-8")
+        # O_APPEND descriptor, opened on first write and kept for the process lifetime.
+        # _size tracks the file length so it is only fstat'ed again near MAX_LOG_SIZE.
+        self._fd = None
+        self._size = 0
+        atexit.register(self.close)
+
+    def _open(self):
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+        self._fd = os.open(self.log_path, flags, 0o644)
+        self._size = os.fstat(self._fd).st_size
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _rotate_if_needed(self):
+        """Rotate once the file reaches MAX_LOG_SIZE (fstat also sees other processes' appends)."""
+        size = os.fstat(self._fd).st_size
+        if size < MAX_LOG_SIZE:
+            self._size = size
+            return
+        self.close()  # Windows can't rename the file while it is open
+        _rotate_files(self.log_path)
+        self._open()
 
     def _write(self, level, message):
-        _rotate_if_needed(self.log_path)
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        line = f"{timestamp} [{level}] [{self.manager_name}] {message}\n"
-        with open(self.log_path, "a", encoding="utf-8") as f:
-            f.write(line)
+        if self._fd is None:
+            self._open()
+        if self._size >= MAX_LOG_SIZE:
+            self._rotate_if_needed()
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S").encode("ascii")
+        data = b"%s [%s] [%s] %s\n" % (timestamp, level, self._name_b, str(message).encode("utf-8"))
+        os.write(self._fd, data)
+        self._size += len(data)
 
     def info(self, message):
-        self._write("INFO", message)
+        self._write(b"INFO", message)
 
     def warn(self, message):
-        self._write("WARN", message)
+        self._write(b"WARN", message)
 
     def error(self, message):
-        self._write("ERROR", message)
+        self._write(b"ERROR", message)
 
     def debug(self, message):
-        self._write("DEBUG", message)
+        self._write(b"DEBUG", message)
 
 
 def create_logger(manager_name):
@@ -3,7 +3,13 @@ output_formatter.py - Tables, trees, and dashboards for terminal output.
 
 Formats data into readable terminal output. No emojis (per project rules).
 Uses plain text indicators: OK, WARN, ERROR, OFF.
+
+This is all str work (str(), padding, joins) and is meant to stay plain CPython.
+Don't wrap it in a JIT such as Numba's @njit: nopython mode barely supports
+str operations and object mode runs them slower than the interpreter does.
 """
+import io
+import operator
 
 
 def table(headers, rows):
@@ -14,25 +20,37 @@ def table(headers, rows):
     """
     if not rows:
         return "(empty)"
-    # Calculate column widths
-    widths = [len(h) for h in headers]
-    for row in rows:
+    # Stringify every cell once; widths are measured from the same strings
+    return _table_prepared(headers, [list(map(str, row)) for row in rows])
+
+
+def _table_prepared(headers, str_rows):
+    """table() for rows whose cells are already str - no conversion pass."""
+    if not str_rows:
+        return "(empty)"
+    widths = list(map(len, headers))
+    for row in str_rows:
         for i, cell in enumerate(row):
-            widths[i] = max(widths[i], len(str(cell)))
-    # Header
-    header_line = "  ".join(h.ljust(widths[i]) for i, h in enumerate(headers))
-    separator = "  ".join("-" * w for w in widths)
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+    buf = io.StringIO()
+    # Header; format specs pad each cell in one step
+    buf.write("  ".join(f"{h:<{widths[i]}}" for i, h in enumerate(headers)))
+    buf.write("\n")
+    buf.write("  ".join("-" * w for w in widths))
     # Rows
-    lines = [header_line, separator]
-    for row in rows:
-        lines.append("  ".join(str(cell).ljust(widths[i]) for i, cell in enumerate(row)))
-    return "\n".join(lines)
+    for row in str_rows:
+        buf.write("\n")
+        for i, cell in enumerate(row):
+            if i:
+                buf.write("  ")
+            buf.write(f"{cell:<{widths[i]}}")
+    return buf.getvalue()
 
 
 def status_line(manager_name, total, healthy, issues):
     """Format a single manager's status: 'Hook Manager     11 registered    11 healthy    0 issues'"""
-    name = f"{manager_name}".ljust(25)
-    return f"{name}{total:>3} registered  {healthy:>3} healthy  {issues:>3} issues"
+    return "%-25s%3d registered  %3d healthy  %3d issues" % (manager_name, total, healthy, issues)
 
 
 def dashboard(manager_stats):
@@ -40,13 +58,14 @@ def dashboard(manager_stats):
     Format a full dashboard from all managers.
     manager_stats: [{"name": "Hook Manager", "total": 11, "healthy": 11, "issues": 0}, ...]
     """
-    lines = ["", "Super Manager Status", "=" * 60, ""]
+    buf = io.StringIO()
+    buf.write("\nSuper Manager Status\n" + "=" * 60 + "\n\n")
     for stat in manager_stats:
-        lines.append(status_line(
+        buf.write(status_line(
             stat["name"], stat["total"], stat["healthy"], stat["issues"]
         ))
-    lines.append("")
-    return "\n".join(lines)
+        buf.write("\n")
+    return buf.getvalue()
 
 
 def item_list(items, columns):
@@ -55,18 +74,33 @@ def item_list(items, columns):
     items: [{"name": "foo", "enabled": True, ...}, ...]
     columns: [("name", "Name"), ("enabled", "Status")]
     """
+    if not items:
+        return "(empty)"
     headers = [col[1] for col in columns]
+    keys = [col[0] for col in columns]
+    # One C-level fetch of every column; with a single key itemgetter returns a bare value
+    getter = operator.itemgetter(*keys) if keys else (lambda item: ())
+    single = len(keys) == 1
     rows = []
     for item in items:
+        try:
+            values = getter(item)
+        except KeyError:  # item lacks one of the columns
+            values = [item.get(key, "") for key in keys]
+        else:
+            if single:
+                values = (values,)
         row = []
-        for key, _ in columns:
-            val = item.get(key, "")
-            if isinstance(val, bool):
-                val = "ON" if val else "OFF"
-            elif isinstance(val, list):
-                val = ", ".join(str(v) for v in val[:3])
-                if len(item.get(key, [])) > 3:
+        for raw in values:
+            if isinstance(raw, bool):
+                val = "ON" if raw else "OFF"
+            elif isinstance(raw, list):
+                val = ", ".join(map(str, raw[:3]))
+                if len(raw) > 3:
                     val += "..."
-            row.append(str(val))
+            else:
+                val = str(raw)
+            row.append(val)
         rows.append(row)
-    return table(headers, rows)
+    # Cells are str already; skip table()'s conversion pass
+    return _table_prepared(headers, rows)
@@ -6,6 +6,10 @@ super_manager.py - Unified CLI for managing all Claude Code configuration.
 """
 import sys
 import os
+import functools
+import importlib
+import io
+import re
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -15,27 +19,55 @@ from shared.output_formatter import item_list
 log = create_logger("super-manager")
 
 
+_MANAGER_MODULES = {
+    "hooks": "managers.hook_manager",
+    "skills": "managers.skill_manager",
+    "mcp": "managers.mcp_server_manager",
+    "instructions": "managers.instruction_manager",
+    "credentials": "managers.credential_manager",
+}
+_MGR_CACHE = {}
+# Display titles used in list/verify headings
+_MGR_TITLE = {name: name.title() for name in _MANAGER_MODULES}
+
+# Item fields left out of the `<manager> list` table
+_SKIP_COLS = frozenset({
+    "command", "file_exists", "in_settings", "in_registry",
+    "skill_path", "file_path", "has_content", "on_disk", "keywords",
+})
+
+# Separator for --keywords "a, b ,c": the comma plus any whitespace around it
+_KW_RE = re.compile(r"\s*,\s*")
+
+
 def _get_manager(name):
-    mapping = {
-        "hooks": "managers.hook_manager",
-        "skills": "managers.skill_manager",
-        "mcp": "managers.mcp_server_manager",
-        "instructions": "managers.instruction_manager",
-        "credentials": "managers.credential_manager",
-    }
-    module_path = mapping.get(name)
-    if not module_path:
-        print(f"Unknown manager: {name}")
-        sys.exit(1)
-    return __import__(module_path, fromlist=["list_all"])
+    mgr = _MGR_CACHE.get(name)
+    if mgr is None:
+        module_path = _MANAGER_MODULES.get(name)
+        if not module_path:
+            print(f"Unknown manager: {name}")
+            sys.exit(1)
+        mgr = _MGR_CACHE[name] = importlib.import_module(module_path)
+    return mgr
+
 
+def _parse_flags(args):
+    """
+    One pass over args: {"--flag": following arg} for every --flag that has one.
+    The first occurrence of a repeated flag wins.
+    """
+    flags = {}
+    for i in range(len(args) - 1):
+        a = args[i]
+        if a.startswith("--") and a not in flags:
+            flags[a] = args[i + 1]
+    return flags
 
-def _get_flag(args, flag, default=None):
-    try:
-        idx = args.index(flag)
-        return args[idx + 1]
-    except (ValueError, IndexError):
-        return default
+
+@functools.lru_cache(maxsize=64)
+def _col_header(key):
+    """Column heading for an item field: 'auto_start' -> 'Auto Start'."""
+    return key.replace("_", " ").title()
 
 
 def cmd_status(args):
@@ -72,22 +104,29 @@ def cmd_discover(args):
     run(report_only=report)
 
 
+def cmd_manager(manager_name, args):
+    if not args:
+        print(f"Usage: super_manager.py {manager_name} <action>")
+        print("Actions: list, add, remove, enable, disable, verify")
+        sys.exit(1)
+    cmd_manager_action(manager_name, args[0], args[1:])
+
+
 def cmd_manager_action(manager_name, action, args):
     mgr = _get_manager(manager_name)
+    # Multi-line reports are assembled here and written to stdout in one call
+    out = io.StringIO()
 
     if action == "list":
         result = mgr.list_all()
         items = result.get("items", [])
         summary = result.get("summary", "")
-        print()
-        print(f"{manager_name.title()}: {summary}")
-        print()
+        out.write(f"\n{_MGR_TITLE[manager_name]}: {summary}\n\n")
         if items:
-            skip = {"command", "file_exists", "in_settings", "in_registry",
-                    "skill_path", "file_path", "has_content", "on_disk", "keywords"}
-            cols = [(k, k.replace("_", " ").title()) for k in items[0].keys() if k not in skip][:5]
-            print(item_list(items, cols))
-        print()
+            cols = [(k, _col_header(k)) for k in items[0].keys() if k not in _SKIP_COLS][:5]
+            out.write(item_list(items, cols))
+            out.write("\n")
+        out.write("\n")
 
     elif action == "add":
         _do_add(manager_name, mgr, args)
@@ -120,32 +159,30 @@ def cmd_manager_action(manager_name, action, args):
         result = mgr.verify_all()
         healthy = result.get("healthy", [])
         issues = result.get("issues", [])
-        print()
-        print(f"{manager_name.title()} Verification")
-        print(f"Healthy: {len(healthy)}, Issues: {len(issues)}")
+        out.write(f"\n{_MGR_TITLE[manager_name]} Verification\n")
+        out.write(f"Healthy: {len(healthy)}, Issues: {len(issues)}\n")
         for issue in issues:
             item_name = issue.get("item", "?")
             problem = issue.get("problem", "?")
-            print(f"  [ISSUE] {item_name}: {problem}")
+            out.write(f"  [ISSUE] {item_name}: {problem}\n")
         if not issues:
-            print("  All items healthy")
-        print()
+            out.write("  All items healthy\n")
+        out.write("\n")
 
     elif action == "match" and manager_name == "instructions":
-        prompt = " ".join(args) if args else ""
-        if not prompt:
+        if not args:
             print("Usage: instructions match <prompt text>")
             sys.exit(1)
+        prompt = " ".join(args)
         matches = mgr.get_matching_instructions(prompt)
-        print()
-        print("Matching instructions:")
+        out.write("\nMatching instructions:\n")
         for m in matches:
             mid = m.get("id", "?")
             mname = m.get("name", "?")
-            print(f"  - {mid}: {mname}")
+            out.write(f"  - {mid}: {mname}\n")
         if not matches:
-            print("  (no matches)")
-        print()
+            out.write("  (no matches)\n")
+        out.write("\n")
 
     elif action == "store" and manager_name == "credentials":
         key = args[0] if args else None
@@ -169,39 +206,41 @@ def cmd_manager_action(manager_name, action, args):
     elif action == "audit" and manager_name == "credentials":
         result = mgr.audit_plaintext()
         findings = result.get("findings", [])
-        print()
-        print("Credential Audit")
+        out.write("\nCredential Audit\n")
         if findings:
-            print(f"  {len(findings)} plaintext tokens found:")
+            out.write(f"  {len(findings)} plaintext tokens found:\n")
             for f in findings:
                 fpath = f.get("file", f.get("env_path", "?"))
-                print(f"  [WARN] {f['service']}/{f['variable']} in {fpath}")
-            print()
-            print("  Migrate with:")
+                out.write(f"  [WARN] {f['service']}/{f['variable']} in {fpath}\n")
+            out.write("\n  Migrate with:\n")
             seen = set()
             for f in findings:
                 fpath = f.get("file", f.get("env_path", "?"))
                 cmd_key = (fpath, f["service"])
                 if cmd_key not in seen:
                     seen.add(cmd_key)
-                    print(f'    python super_manager.py credentials migrate "{fpath}" {f["service"]}')
+                    out.write(f'    python super_manager.py credentials migrate "{fpath}" {f["service"]}\n')
         else:
-            print("  No plaintext tokens found. All secure!")
-        print()
+            out.write("  No plaintext tokens found. All secure!\n")
+        out.write("\n")
 
     else:
         print(f"Unknown action: {action}")
         print("Available: list, add, remove, enable, disable, verify")
         sys.exit(1)
 
+    if out.tell():
+        sys.stdout.write(out.getvalue())
+
 
 def _do_add(manager_name, mgr, args):
+    flags = _parse_flags(args)
     if manager_name == "hooks":
         name = args[0] if args else None
-        event = _get_flag(args, "--event")
-        command = _get_flag(args, "--command")
-        desc = _get_flag(args, "--description", "")
-        matcher = _get_flag(args, "--matcher", "*")
+        event = flags.get("--event")
+        command = flags.get("--command")
+        desc = flags.get("--description", "")
+        matcher = flags.get("--matcher", "*")
         if not all([name, event, command]):
             print("Usage: hooks add <name> --event <event> --command <cmd>")
             sys.exit(1)
@@ -209,10 +248,10 @@ def _do_add(manager_name, mgr, args):
         print(result.get("message", "Done"))
     elif manager_name == "skills":
         name = args[0] if args else None
-        path = _get_flag(args, "--path")
-        desc = _get_flag(args, "--description", "")
-        kw = _get_flag(args, "--keywords", "")
-        keywords = [k.strip() for k in kw.split(",")] if kw else []
+        path = flags.get("--path")
+        desc = flags.get("--description", "")
+        kw = flags.get("--keywords", "")
+        keywords = _KW_RE.split(kw.strip()) if kw else []
         if not all([name, path]):
             print("Usage: skills add <name> --path <path> [--keywords <kw1,kw2>]")
             sys.exit(1)
@@ -220,10 +259,10 @@ def _do_add(manager_name, mgr, args):
         print(result.get("message", "Done"))
     elif manager_name == "instructions":
         inst_id = args[0] if args else None
-        name = _get_flag(args, "--name")
-        kw = _get_flag(args, "--keywords", "")
-        keywords = [k.strip() for k in kw.split(",")] if kw else []
-        content = _get_flag(args, "--content", "")
+        name = flags.get("--name")
+        kw = flags.get("--keywords", "")
+        keywords = _KW_RE.split(kw.strip()) if kw else []
+        content = flags.get("--content", "")
         if not all([inst_id, name]):
             print("Usage: instructions add <id> --name <name> --keywords <kw1,kw2>")
             sys.exit(1)
@@ -233,6 +272,17 @@ def _do_add(manager_name, mgr, args):
         print(f"Add not supported for {manager_name}")
 
 
+# Top-level command -> handler(rest); manager modules are only imported when dispatched to
+_DISPATCH = {
+    "status": cmd_status,
+    "doctor": cmd_doctor,
+    "report": cmd_report,
+    "duplicates": cmd_duplicates,
+    "discover": cmd_discover,
+}
+_DISPATCH.update((name, functools.partial(cmd_manager, name)) for name in _MANAGER_MODULES)
+
+
 def main():
     if len(sys.argv) < 2:
         print("Super Manager - Unified Claude Code Configuration")
@@ -261,29 +311,11 @@ def main():
         sys.exit(0)
 
     command = sys.argv[1]
-    rest = sys.argv[2:]
-
-    if command == "status":
-        cmd_status(rest)
-    elif command == "doctor":
-        cmd_doctor(rest)
-    elif command == "report":
-        cmd_report(rest)
-    elif command == "duplicates":
-        cmd_duplicates(rest)
-    elif command == "discover":
-        cmd_discover(rest)
-    elif command in ("hooks", "skills", "mcp", "instructions", "credentials"):
-        if not rest:
-            print(f"Usage: super_manager.py {command} <action>")
-            print("Actions: list, add, remove, enable, disable, verify")
-            sys.exit(1)
-        action = rest[0]
-        action_args = rest[1:]
-        cmd_manager_action(command, action, action_args)
-    else:
+    handler = _DISPATCH.get(command)
+    if handler is None:
         print(f"Unknown command: {command}")
         sys.exit(1)
+    handler(sys.argv[2:])
 
 
 if __name__ == "__main__":
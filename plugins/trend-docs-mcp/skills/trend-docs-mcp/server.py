@@ -22,7 +22,13 @@ import time
 import asyncio
 import subprocess
 import logging
+import functools
+import hashlib
+import json
+import random
+from contextlib import asynccontextmanager
 from pathlib import Path
+from urllib.parse import urljoin, urlparse
 
 # Force UTF-8 on Windows
 if hasattr(sys.stdout, 'buffer'):
@@ -34,9 +40,26 @@ log = logging.getLogger("trend-docs")
 
 from mcp.server.fastmcp import FastMCP
 
+# selectolax is optional: with it, page Markdown is built in Python from the raw
+# HTML; without it the in-browser JS extractors do the conversion.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# httpx is optional: with it (and selectolax), pages whose content is already in
+# the server-rendered HTML are read without opening a browser tab.
+try:
+    import httpx
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # no per-request INFO lines
+except ImportError:
+    httpx = None
+
 
 # ============ Auto-install helpers ============
+# Each resolves its import once per process; later calls return the cached result.
 
+@functools.lru_cache(maxsize=None)
 def ensure_ddgs():
     """Auto-install ddgs if missing."""
     try:
@@ -49,6 +72,7 @@ def ensure_ddgs():
         return DDGS
 
 
+@functools.lru_cache(maxsize=None)
 def ensure_playwright_async():
     """Auto-install playwright + chromium if missing. Returns async_playwright."""
     try:
@@ -63,6 +87,25 @@ def ensure_playwright_async():
         return async_playwright
 
 
+@functools.lru_cache(maxsize=None)
+def ensure_pymupdf():
+    """Auto-install PyMuPDF if missing. Returns the pymupdf (formerly fitz) module."""
+    try:
+        import pymupdf
+        return pymupdf
+    except ImportError:
+        pass
+    try:
+        import fitz  # PyMuPDF < 1.24.3
+        return fitz
+    except ImportError:
+        log.info("Installing PyMuPDF...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "pymupdf", "-q"])
+        import pymupdf
+        return pymupdf
+
+
+@functools.lru_cache(maxsize=None)
 def ensure_pypdf2():
     """Auto-install PyPDF2 if missing."""
     try:
@@ -86,6 +129,24 @@ BROWSER_ARGS = [
     "--no-first-run",
     "--disable-sync",
 ]
+# HTML pages loaded at once by trend_docs_extract (one tab each); callers can
+# override per call with max_parallel
+MAX_PARALLEL_PAGES = 4
+# Navigations/downloads in flight per host, across all tool calls - more than
+# this gets the Akamai front end throttling us
+MAX_PARALLEL_PER_HOST = 3
+# PDFs downloading at once per call, and PDFs being parsed at once across all
+# calls (parsing is CPU-bound, so keep that small)
+MAX_PARALLEL_PDFS = 3
+MAX_PARALLEL_PDF_PARSES = 2
+# Only the first pages of a PDF guide are extracted, and reading stops early
+# once this much text has been collected
+PDF_PAGE_LIMIT = 20
+PDF_MAX_CHARS = 50_000
+# Requests aborted before they hit the network - extraction only reads text.
+# Stylesheets stay allowed: the SPAs may wait on CSS before rendering content.
+BLOCKED_RESOURCE_TYPES = frozenset(("image", "font", "media"))
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net")
 
 
 # ============ Helpers ============
@@ -94,8 +155,11 @@ def is_olh(url):
     return "docs.trendmicro.com" in url
 
 
+_PDF_RE = re.compile(r"\.pdf/*$", re.IGNORECASE)
+
+
 def is_pdf(url):
-    return url.lower().rstrip("/").endswith(".pdf")
+    return _PDF_RE.search(url) is not None
 
 
 def get_downloads_dir():
@@ -106,32 +170,64 @@ def get_downloads_dir():
 
 # ============ JS extractors (from executor.py) ============
 
-OLH_EXTRACT_JS = """() => {
-    const res = {content: "", title: document.title, related: []};
-    const main = document.querySelector(".main-content");
-    if (!main) { res.content = document.body.textContent.trim().substring(0, 5000); return res; }
-    const clone = main.cloneNode(true);
-    const menu = clone.querySelector(".article-menu");
-    if (menu) menu.remove();
+# Child/sibling/parent links around the current page in the OLH sidebar menu
+OLH_RELATED_JS = """function olhRelated() {
+    const related = [];
+    const menuEl = document.querySelector(".article-menu");
+    if (!menuEl) return related;
+    const currentSlug = window.location.pathname.split("/").pop();
+    const allLinks = menuEl.querySelectorAll("a.item-link");
+    let currentLi = null;
+    for (const link of allLinks) {
+        const href = link.getAttribute("href") || "";
+        if (href === currentSlug || href.endsWith("/" + currentSlug)) { currentLi = link.closest("li"); break; }
+    }
+    if (!currentLi) return related;
+    const childGroup = currentLi.querySelector(":scope > .menu-group > ul");
+    if (childGroup) {
+        childGroup.querySelectorAll(":scope > li > .menu-item > a.item-link").forEach(a => {
+            related.push({title: a.textContent.trim(), slug: a.getAttribute("href"), type: "child"});
+        });
+    }
+    const parentUl = currentLi.parentElement;
+    if (parentUl) {
+        parentUl.querySelectorAll(":scope > li > .menu-item > a.item-link").forEach(a => {
+            const slug = a.getAttribute("href");
+            if (slug !== currentSlug) related.push({title: a.textContent.trim(), slug: slug, type: "sibling"});
+        });
+    }
+    const parentLi = currentLi.parentElement ? currentLi.parentElement.closest("li") : null;
+    if (parentLi) {
+        const pl = parentLi.querySelector(":scope > .menu-item > a.item-link");
+        if (pl) related.push({title: pl.textContent.trim(), slug: pl.getAttribute("href"), type: "parent"});
+    }
+    return related;
+}"""
 
-    function toMd(node) {
-        if (!node) return "";
-        if (node.nodeType === 3) return node.textContent;
-        if (node.nodeType !== 1) return "";
-        const tag = node.tagName;
-        const kids = Array.from(node.childNodes).map(c => toMd(c)).join("");
-        if (/^H[1-6]$/.test(tag)) return "\\n" + "#".repeat(parseInt(tag[1])) + " " + kids.trim() + "\\n\\n";
-        if (tag === "P") return kids.trim() + "\\n\\n";
-        if (tag === "LI") return "- " + kids.trim() + "\\n";
-        if (tag === "UL" || tag === "OL") return "\\n" + kids + "\\n";
-        if (tag === "PRE" || tag === "CODE") return "```\\n" + node.textContent.trim() + "\\n```\\n\\n";
-        if (tag === "BR") return "\\n";
-        if (tag === "A" && node.href) return "[" + kids.trim() + "](" + node.href + ")";
-        if (tag === "STRONG" || tag === "B") return "**" + kids.trim() + "**";
-        if (tag === "EM" || tag === "I") return "*" + kids.trim() + "*";
-        if (tag === "TABLE") {
-            const rows = node.querySelectorAll("tr");
-            if (rows.length === 0) return kids;
+
+# DOM -> Markdown walker shared by both extractors: one table lookup per element
+# instead of a chain of tag comparisons
+MD_WALKER_JS = """
+    const MD_SKIP = new Set(["NAV","HEADER","FOOTER","SCRIPT","STYLE","NOSCRIPT","THEAD","TBODY","TFOOT","TR","TH","TD"]);
+    // Rendered from the element's own text; children are never walked
+    const MD_OWN = {
+        BR: () => "\\n",
+        PRE: n => "```\\n" + n.textContent.trim() + "\\n```\\n\\n",
+        CODE: n => "```\\n" + n.textContent.trim() + "\\n```\\n\\n",
+    };
+    const MD = {
+        P: (n, k) => k.trim() + "\\n\\n",
+        LI: (n, k) => "- " + k.trim() + "\\n",
+        UL: (n, k) => "\\n" + k + "\\n",
+        OL: (n, k) => "\\n" + k + "\\n",
+        A: (n, k) => n.href ? "[" + k.trim() + "](" + n.href + ")" : k,
+        STRONG: (n, k) => "**" + k.trim() + "**",
+        B: (n, k) => "**" + k.trim() + "**",
+        EM: (n, k) => "*" + k.trim() + "*",
+        I: (n, k) => "*" + k.trim() + "*",
+        TABLE: (n, k) => {
+            const rows = n.querySelectorAll("tr");
+            if (rows.length === 0) return k;
             let md = "\\n";
             rows.forEach((row, i) => {
                 const cells = Array.from(row.querySelectorAll("th, td"));
@@ -139,88 +235,311 @@ OLH_EXTRACT_JS = """() => {
                 if (i === 0) md += "| " + cells.map(() => "---").join(" | ") + " |\\n";
             });
             return md + "\\n";
-        }
-        if (["THEAD","TBODY","TFOOT","TR","TH","TD"].includes(tag)) return "";
-        return kids;
+        },
+    };
+    for (let i = 1; i <= 6; i++) {
+        const hashes = "#".repeat(i) + " ";
+        MD["H" + i] = (n, k) => "\\n" + hashes + k.trim() + "\\n\\n";
     }
 
-    res.content = toMd(clone).replace(/\\n{3,}/g, "\\n\\n").trim();
-
-    const menuEl = document.querySelector(".article-menu");
-    if (menuEl) {
-        const currentSlug = window.location.pathname.split("/").pop();
-        const allLinks = menuEl.querySelectorAll("a.item-link");
-        let currentLi = null;
-        for (const link of allLinks) {
-            const href = link.getAttribute("href") || "";
-            if (href === currentSlug || href.endsWith("/" + currentSlug)) { currentLi = link.closest("li"); break; }
-        }
-        if (currentLi) {
-            const childGroup = currentLi.querySelector(":scope > .menu-group > ul");
-            if (childGroup) {
-                childGroup.querySelectorAll(":scope > li > .menu-item > a.item-link").forEach(a => {
-                    res.related.push({title: a.textContent.trim(), slug: a.getAttribute("href"), type: "child"});
-                });
-            }
-            const parentUl = currentLi.parentElement;
-            if (parentUl) {
-                parentUl.querySelectorAll(":scope > li > .menu-item > a.item-link").forEach(a => {
-                    const slug = a.getAttribute("href");
-                    if (slug !== currentSlug) res.related.push({title: a.textContent.trim(), slug: slug, type: "sibling"});
-                });
-            }
-            const parentLi = currentLi.parentElement ? currentLi.parentElement.closest("li") : null;
-            if (parentLi) {
-                const pl = parentLi.querySelector(":scope > .menu-item > a.item-link");
-                if (pl) res.related.push({title: pl.textContent.trim(), slug: pl.getAttribute("href"), type: "parent"});
-            }
-        }
+    function toMd(node) {
+        if (!node) return "";
+        if (node.nodeType === 3) return node.textContent;
+        if (node.nodeType !== 1) return "";
+        const tag = node.tagName;
+        if (MD_SKIP.has(tag) || node.classList.contains("article-menu")) return "";
+        const own = MD_OWN[tag];
+        if (own) return own(node);
+        let kids = "";
+        for (const c of node.childNodes) kids += toMd(c);
+        const h = MD[tag];
+        return h ? h(node, kids) : kids;
     }
+"""
+
+
+OLH_EXTRACT_JS = """() => {
+""" + OLH_RELATED_JS + MD_WALKER_JS + """
+    const res = {content: "", title: document.title, related: []};
+    const main = document.querySelector(".main-content");
+    if (!main) { res.content = document.body.textContent.trim().substring(0, 5000); return res; }
+    // The walker drops .article-menu itself, so main is converted in place
+    res.content = toMd(main).replace(/\\n{3,}/g, "\\n\\n").trim();
+
+    res.related = olhRelated();
     return res;
 }"""
 
 
 KB_EXTRACT_JS = """() => {
+""" + MD_WALKER_JS + """
     const res = {content: "", title: document.title, related: []};
     const main = document.querySelector("main.article-page, main");
     if (!main) { res.content = document.body.textContent.trim().substring(0, 5000); return res; }
-    function toMd(node) {
-        if (!node) return "";
-        if (node.nodeType === 3) return node.textContent;
-        if (node.nodeType !== 1) return "";
-        const tag = node.tagName;
-        if (["NAV","HEADER","FOOTER","SCRIPT","STYLE","NOSCRIPT"].includes(tag)) return "";
-        const kids = Array.from(node.childNodes).map(c => toMd(c)).join("");
-        if (/^H[1-6]$/.test(tag)) return "\\n" + "#".repeat(parseInt(tag[1])) + " " + kids.trim() + "\\n\\n";
-        if (tag === "P") return kids.trim() + "\\n\\n";
-        if (tag === "LI") return "- " + kids.trim() + "\\n";
-        if (tag === "UL" || tag === "OL") return "\\n" + kids + "\\n";
-        if (tag === "PRE" || tag === "CODE") return "```\\n" + node.textContent.trim() + "\\n```\\n\\n";
-        if (tag === "BR") return "\\n";
-        if (tag === "A" && node.href) return "[" + kids.trim() + "](" + node.href + ")";
-        if (tag === "STRONG" || tag === "B") return "**" + kids.trim() + "**";
-        if (tag === "TABLE") {
-            const rows = node.querySelectorAll("tr");
-            let md = "\\n";
-            rows.forEach((row, i) => {
-                const cells = Array.from(row.querySelectorAll("th, td"));
-                md += "| " + cells.map(c => c.textContent.trim().replace(/\\|/g, "/")).join(" | ") + " |\\n";
-                if (i === 0) md += "| " + cells.map(() => "---").join(" | ") + " |\\n";
-            });
-            return md + "\\n";
-        }
-        if (["THEAD","TBODY","TFOOT","TR","TH","TD"].includes(tag)) return "";
-        return kids;
-    }
     res.content = toMd(main).replace(/\\n{3,}/g, "\\n\\n").trim();
     return res;
 }"""
 
 
+# With selectolax installed the page only hands back the content element's HTML
+# (plus the OLH related links); Markdown is then built in Python.
+PAGE_HTML_JS = """(olh) => {
+""" + OLH_RELATED_JS + """
+    const res = {html: "", content: "", title: document.title, related: [], base: document.baseURI};
+    const main = document.querySelector(olh ? ".main-content" : "main.article-page, main");
+    if (!main) { res.content = document.body.textContent.trim().substring(0, 5000); return res; }
+    res.html = main.outerHTML;
+    if (olh) res.related = olhRelated();
+    return res;
+}"""
+
+
+# Installed on the shared context so every page defines the extractors itself;
+# each extract then sends a one-line call instead of the full source.
+EXTRACT_INIT_JS = (
+    f"window.__trendExtractOlh = {OLH_EXTRACT_JS};\n"
+    f"window.__trendExtractKb = {KB_EXTRACT_JS};\n"
+    f"window.__trendPageHtml = {PAGE_HTML_JS};\n"
+)
+# True once the content container holds real text (not just the SPA shell)
+CONTENT_READY_JS = """(sel) => {
+    const el = document.querySelector(sel);
+    return !!el && el.innerText.trim().length > 100;
+}"""
+OLH_CALL_JS = "() => window.__trendExtractOlh ? window.__trendExtractOlh() : null"
+KB_CALL_JS = "() => window.__trendExtractKb ? window.__trendExtractKb() : null"
+PAGE_HTML_CALL_JS = "(olh) => window.__trendPageHtml ? window.__trendPageHtml(olh) : null"
+
+
+# ============ HTML -> Markdown (selectolax) ============
+# Same output rules as MD_WALKER_JS, applied to the HTML PAGE_HTML_JS returns.
+
+_MD_SKIP_TAGS = frozenset(("nav", "header", "footer", "script", "style", "noscript"))
+_MD_TABLE_PARTS = frozenset(("thead", "tbody", "tfoot", "tr", "th", "td"))
+_MD_HEADINGS = {f"h{n}": "#" * n + " " for n in range(1, 7)}
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def _table_to_md(node, kids):
+    rows = node.css("tr")
+    if not rows:
+        return kids()
+    parts = ["\n"]
+    for i, row in enumerate(rows):
+        cells = [c.text(deep=True).strip().replace("|", "/") for c in row.css("th, td")]
+        parts.append("| " + " | ".join(cells) + " |\n")
+        if i == 0:
+            parts.append("| " + " | ".join(["---"] * len(cells)) + " |\n")
+    parts.append("\n")
+    return "".join(parts)
+
+
+def _node_to_md(node, base_url):
+    if node.is_text_node:
+        return node.text_content or ""
+    if not node.is_element_node:
+        return ""
+    tag = node.tag
+    if tag in _MD_SKIP_TAGS:
+        return ""
+    # Tags rendered from their own text never need their children converted
+    if tag == "br":
+        return "\n"
+    if tag in ("pre", "code"):
+        return "```\n" + node.text(deep=True).strip() + "\n```\n\n"
+    if tag == "table":
+        return _table_to_md(node, lambda: _children_to_md(node, base_url))
+    if tag in _MD_TABLE_PARTS:
+        return ""
+
+    kids = _children_to_md(node, base_url)
+    heading = _MD_HEADINGS.get(tag)
+    if heading:
+        return "\n" + heading + kids.strip() + "\n\n"
+    if tag == "p":
+        return kids.strip() + "\n\n"
+    if tag == "li":
+        return "- " + kids.strip() + "\n"
+    if tag in ("ul", "ol"):
+        return "\n" + kids + "\n"
+    if tag == "a":
+        href = node.attributes.get("href")
+        if href is not None:
+            return "[" + kids.strip() + "](" + urljoin(base_url, href) + ")"
+    elif tag in ("strong", "b"):
+        return "**" + kids.strip() + "**"
+    elif tag in ("em", "i"):
+        return "*" + kids.strip() + "*"
+    return kids
+
+
+def _children_to_md(node, base_url):
+    return "".join([_node_to_md(child, base_url) for child in node.iter(include_text=True)])
+
+
+def _element_to_markdown(root, base_url, olh):
+    if olh:
+        for menu in root.css(".article-menu"):
+            menu.decompose()
+    return _BLANK_LINES_RE.sub("\n\n", _node_to_md(root, base_url)).strip()
+
+
+def html_to_markdown(html, base_url, olh):
+    """Convert a content element's outerHTML to Markdown (OLH: minus the sidebar menu)."""
+    root = LexborHTMLParser(html).css_first("body > *")
+    if root is None:
+        return ""
+    return _element_to_markdown(root, base_url, olh)
+
+
+def static_page_result(html, base_url, olh):
+    """
+    Extract a page from server-rendered HTML. Returns None when it needs the
+    browser: no content element, an SPA shell, or an OLH sidebar menu (its
+    related links are resolved against the live page in JS).
+    """
+    tree = LexborHTMLParser(html)
+    root = tree.css_first(".main-content" if olh else "main.article-page, main")
+    if root is None or (olh and tree.css_first(".article-menu") is not None):
+        return None
+    content = _element_to_markdown(root, base_url, olh)
+    if len(content) < 100 or "window[" in content[:200]:
+        return None
+    title = tree.css_first("title")
+    title = " ".join(title.text().split()) if title is not None else base_url
+    return {"content": content, "title": title, "related": []}
+
+
+# ============ Result caches ============
+
+class TTLCache:
+    """Small in-process cache. Entries expire after ttl seconds; past maxsize the oldest is dropped."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = {}  # key -> (expires_at, value), in insertion order
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._data[key]
+            return None
+        return entry[1]
+
+    def set(self, key, value):
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+
+# (query, max_results) -> result list; url -> (section, saved path or None)
+_search_cache = TTLCache(maxsize=1024, ttl=3600)
+_extract_cache = TTLCache(maxsize=256, ttl=1800)
+
+
+# ============ Run checkpoints ============
+
+CHECKPOINT_DIR = Path.home() / ".cache" / "trend-docs"
+# A checkpoint is deleted once every URL in its run has succeeded; one left
+# behind by a run that never finished is ignored, then pruned, once this old
+CHECKPOINT_MAX_AGE = 24 * 3600
+
+
+class RunCheckpoint:
+    """
+    Append-only JSONL record of the sections finished for one URL list.
+    If an extract call dies part-way (browser crash, dropped connection), a
+    retry with the same URLs reads the finished sections back instead of
+    rendering those pages again. Only successful extractions are recorded.
+    """
+
+    def __init__(self, urls):
+        run_id = hashlib.md5(",".join(urls).encode("utf-8")).hexdigest()[:8]
+        self.path = CHECKPOINT_DIR / f"{run_id}.jsonl"
+        self.done = set()  # URLs loaded or recorded by this run
+
+    def load(self):
+        """Finished sections from an earlier attempt: url -> (section, saved path or None)."""
+        try:
+            if time.time() - self.path.stat().st_mtime > CHECKPOINT_MAX_AGE:
+                return {}
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return {}
+        done = {}
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # last line cut short by the crash
+            path = entry.get("path")
+            if path and not os.path.exists(path):
+                path = None
+            done[entry["url"]] = (entry["section"], path)
+        self.done.update(done)
+        return done
+
+    def record(self, url, section, path=None):
+        line = json.dumps({"url": url, "section": section, "path": path}, ensure_ascii=False)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            log.warning(f"Checkpoint write failed: {e}")
+        self.done.add(url)
+
+    def clear(self):
+        """Delete the checkpoint - called once the whole run has succeeded."""
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def prune_checkpoints():
+    """Delete checkpoints of runs that never finished and are past CHECKPOINT_MAX_AGE."""
+    cutoff = time.time() - CHECKPOINT_MAX_AGE
+    try:
+        paths = list(CHECKPOINT_DIR.glob("*.jsonl"))
+    except OSError:
+        return
+    for path in paths:
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def _remember(url, section, path, checkpoint):
+    """Store a fresh extraction in the in-process cache and the run checkpoint."""
+    _extract_cache.set(url, (section, path))
+    if checkpoint is not None:
+        checkpoint.record(url, section, path)
+
+
 # ============ Search module ============
 
-def search_trendmicro(query, max_results=10):
-    """DuckDuckGo site:trendmicro.com search. Returns [{title, url, snippet}]."""
+# DDG starts throttling after a handful of rapid queries: space them out and
+# back off (with jitter) when it reports a rate limit.
+SEARCH_MIN_INTERVAL = 1.0
+SEARCH_RETRIES = 3
+_last_search_ts = 0.0
+_search_lock = asyncio.Lock()
+
+
+def _is_ratelimit(exc):
+    """ddgs signals throttling with RatelimitException."""
+    return "ratelimit" in type(exc).__name__.lower()
+
+
+def _ddg_search(query, max_results):
+    """Blocking DDG query. Returns [{title, url, snippet}]."""
     DDGS = ensure_ddgs()
     full_query = f"site:trendmicro.com {query}"
     results = []
@@ -234,6 +553,36 @@ def search_trendmicro(query, max_results=10):
     return results
 
 
+async def search_trendmicro(query, max_results=10):
+    """DuckDuckGo site:trendmicro.com search. Returns [{title, url, snippet}]."""
+    global _last_search_ts
+    key = (query, max_results)
+    cached = _search_cache.get(key)
+    if cached is not None:
+        return cached
+
+    async with _search_lock:
+        for attempt in range(SEARCH_RETRIES):
+            wait = SEARCH_MIN_INTERVAL - (time.monotonic() - _last_search_ts)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            _last_search_ts = time.monotonic()
+            try:
+                # The ddgs client blocks - keep it off the event loop
+                results = await asyncio.to_thread(_ddg_search, query, max_results)
+                break
+            except Exception as e:
+                if not _is_ratelimit(e) or attempt == SEARCH_RETRIES - 1:
+                    raise
+                delay = 2 ** attempt + random.random()
+                log.info(f"DDG rate limited, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    if results:  # an empty list may just be throttling - ask again next time
+        _search_cache.set(key, results)
+    return results
+
+
 def format_search_results(results):
     """Format search results as numbered markdown list."""
     if not results:
@@ -242,7 +591,7 @@ def format_search_results(results):
     for i, r in enumerate(results, 1):
         source_type = "OLH" if "docs.trendmicro.com" in r["url"] else \
                       "KB" if "success.trendmicro.com" in r["url"] else \
-                      "PDF" if r["url"].lower().endswith(".pdf") else "Other"
+                      "PDF" if is_pdf(r["url"]) else "Other"
         lines.append(f"{i}. [{source_type}] {r['title']}")
         lines.append(f"   {r['url']}")
         if r["snippet"]:
@@ -251,13 +600,131 @@ def format_search_results(results):
     return "\n".join(lines)
 
 
+# ============ Shared browser ============
+
+# One Chromium per server process, launched on the first extract and reused by
+# every later call (startup costs seconds). Tabs are opened and closed per page.
+_playwright = None
+_browser = None
+_context = None
+_browser_lock = asyncio.Lock()
+
+
+async def get_browser_context():
+    """Return the shared browser context, (re)launching Chromium if needed."""
+    global _playwright, _browser, _context
+    async with _browser_lock:
+        if _browser is not None and not _browser.is_connected():
+            log.info("Browser disconnected, relaunching")
+            await close_browser()
+        if _context is None:
+            async_playwright = ensure_playwright_async()
+            _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+            _context = await _browser.new_context(
+                user_agent=UA, java_script_enabled=True, accept_downloads=True
+            )
+            await _context.add_init_script(script=EXTRACT_INIT_JS)
+            await _context.route("**/*", _route_filter)
+        return _context
+
+
+async def _route_filter(route):
+    """Abort images, fonts, media and analytics; let everything else through."""
+    request = route.request
+    url = request.url
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(h in url for h in BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def close_browser():
+    """Close the shared browser and stop Playwright."""
+    global _playwright, _browser, _context
+    if _browser is not None:
+        try:
+            await _browser.close()
+        except Exception:
+            pass
+    if _playwright is not None:
+        try:
+            await _playwright.stop()
+        except Exception:
+            pass
+    _playwright = _browser = _context = None
+
+
+# ============ Plain HTTP fast path ============
+
+_http_client = None
+# The probe is only worth a few seconds - a page that needs longer goes to the browser
+STATIC_PROBE_TIMEOUT = 5
+# host -> True for hosts whose pages came back as SPA shells and that have never
+# served a usable page: their pages go straight to the browser for a day, like
+# the executor's http-probe.json (which also spares hosts with a hit)
+_shell_hosts = TTLCache(maxsize=256, ttl=86400)
+# Hosts that served at least one page without the browser
+_static_hosts = set()
+
+
+def get_http_client():
+    """Shared httpx client (HTTP/2 when the h2 package is installed)."""
+    global _http_client
+    if _http_client is None:
+        kwargs = {"headers": {"User-Agent": UA}, "timeout": 15, "follow_redirects": True}
+        try:
+            _http_client = httpx.AsyncClient(http2=True, **kwargs)
+        except ImportError:
+            _http_client = httpx.AsyncClient(**kwargs)
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def async_fetch_static(url):
+    """Try a page over plain HTTP. Returns an extract result, or None if it needs the browser."""
+    host = urlparse(url).netloc.lower()
+    if _shell_hosts.get(host):
+        return None
+    try:
+        async with host_semaphore(url):
+            resp = await get_http_client().get(url, timeout=STATIC_PROBE_TIMEOUT)
+    except Exception:
+        return None  # a timeout says nothing about whether the host serves shells
+    if resp.status_code != 200 or "html" not in resp.headers.get("content-type", ""):
+        return None
+    result = await asyncio.to_thread(static_page_result, resp.text, str(resp.url), is_olh(url))
+    if result is not None:
+        _static_hosts.add(host)
+    elif host not in _static_hosts:
+        _shell_hosts.set(host, True)
+    return result
+
+
 # ============ Async extract module ============
 
 async def async_extract_page(page_obj, url):
-    """Run JS extractor on a loaded Playwright page (async)."""
-    js = OLH_EXTRACT_JS if is_olh(url) else KB_EXTRACT_JS
+    """Extract title, Markdown content and related links from a loaded Playwright page (async)."""
+    olh = is_olh(url)
     try:
-        result = await page_obj.evaluate(js)
+        if LexborHTMLParser is not None:
+            raw = await page_obj.evaluate(PAGE_HTML_CALL_JS, olh)
+            if raw is None:
+                raw = await page_obj.evaluate(PAGE_HTML_JS, olh)
+            if raw["html"]:
+                # Parsing and conversion are CPU-bound - keep them off the event loop
+                raw["content"] = await asyncio.to_thread(html_to_markdown, raw["html"], raw["base"], olh)
+            return {"content": raw["content"], "title": raw["title"], "url": url, "related": raw["related"]}
+        result = await page_obj.evaluate(OLH_CALL_JS if olh else KB_CALL_JS)
+        if result is None:
+            # Init script didn't run in this document - send the full extractor
+            result = await page_obj.evaluate(OLH_EXTRACT_JS if olh else KB_EXTRACT_JS)
         result["url"] = url
         return result
     except Exception as e:
@@ -269,17 +736,92 @@ async def async_wait_and_extract(page_obj, url):
     content_sel = ".main-content" if is_olh(url) else "main.article-page, main"
     try:
         await page_obj.wait_for_selector(content_sel, timeout=10000)
+        # The container exists; return as soon as the SPA has filled it with text
+        await page_obj.wait_for_function(CONTENT_READY_JS, arg=content_sel, timeout=5000)
     except Exception:
         pass
-    await page_obj.wait_for_timeout(500)
     result = await async_extract_page(page_obj, url)
     # Retry once if SPA shell not rendered
     if not result["content"] or len(result["content"]) < 100 or "window[" in result["content"][:200]:
-        await page_obj.wait_for_timeout(2000)
+        await page_obj.wait_for_timeout(1000)
         result = await async_extract_page(page_obj, url)
     return result
 
 
+def format_page_section(result, url):
+    """Markdown section for one extracted HTML page. Returns (section, has_content)."""
+    title = result.get("title", url)
+    body = result.get("content", "")
+    related = result.get("related", [])
+
+    if "Article unavailable" in title or "window[" in body[:200]:
+        return f"# Page Unavailable\nURL: {url}", False
+    if body and len(body) > 50:
+        parts = [f"# {title}\nSource: {url}\n\n", body]
+        if related:
+            parts.append("\n\n## Related Pages\n")
+            parts.extend(
+                f"- [{rel.get('type', '')}] {rel.get('title', '')} ({rel.get('slug', '')})\n"
+                for rel in related[:10]
+            )
+        return "".join(parts), True
+    return f"# Insufficient Content\nURL: {url}\nExtracted < 50 chars.", False
+
+
+_host_sems = {}
+
+
+def host_semaphore(url):
+    """Shared semaphore limiting concurrent requests to url's host."""
+    host = urlparse(url).netloc.lower()
+    sem = _host_sems.get(host)
+    if sem is None:
+        sem = _host_sems[host] = asyncio.Semaphore(MAX_PARALLEL_PER_HOST)
+    return sem
+
+
+async def async_process_html(url, sem, checkpoint=None):
+    """Load one HTML page in its own tab and extract it. Returns a markdown section."""
+    cached = _extract_cache.get(url)
+    if cached is not None:
+        log.info(f"Cached: {url}")
+        # Checkpoint only - re-setting the entry would push its TTL back on every hit
+        if checkpoint is not None:
+            checkpoint.record(url, cached[0])
+        return cached[0]
+    if httpx is not None and LexborHTMLParser is not None:
+        result = await async_fetch_static(url)
+        if result is not None:
+            section, has_content = format_page_section(result, url)
+            if has_content:
+                log.info(f"Fetched without browser: {url}")
+                _remember(url, section, None, checkpoint)
+                return section
+    async with sem:
+        log.info(f"Loading: {url}")
+        context = await get_browser_context()
+        page = await context.new_page()
+        try:
+            try:
+                async with host_semaphore(url):
+                    await page.goto(url, wait_until="domcontentloaded", timeout=20000)
+            except Exception as e:
+                return f"# Navigation Error\nURL: {url}\nError: {e}"
+            try:
+                result = await async_wait_and_extract(page, url)
+                section, has_content = format_page_section(result, url)
+                if has_content:
+                    _remember(url, section, None, checkpoint)
+                return section
+            except Exception as e:
+                return f"# Extraction Error\nURL: {url}\nError: {e}"
+        finally:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+
 async def async_download_pdf(url, context):
     """Download PDF via Playwright async (handles Akamai cookie redirects).
     Saves to ~/Downloads. Returns (local_path, filename) or (None, error_msg)."""
@@ -305,36 +847,104 @@ async def async_download_pdf(url, context):
         # Fallback: direct request via Playwright API context
         try:
             resp = await context.request.get(url)
-            if resp.status == 200 and len(await resp.body()) > 1000:
-                save_path.write_bytes(await resp.body())
-                return str(save_path), filename
+            if resp.status == 200:
+                body = await resp.body()
+                if len(body) > 1000:
+                    # Write off the event loop; guides can be tens of MB
+                    await asyncio.to_thread(save_path.write_bytes, body)
+                    return str(save_path), filename
         except Exception as e2:
             return None, f"Download failed: {e2}"
     return None, "Download failed: unknown error"
 
 
-def extract_pdf_text(pdf_path, url=""):
-    """Extract text from PDF using PyPDF2. Returns markdown string."""
+def _collect_pages(page_texts, max_chars):
+    """
+    Format (page_number, text) pairs, stopping once max_chars of text is collected.
+    page_texts is consumed lazily, so pages past the budget are never parsed.
+    Returns (texts, pages_read).
+    """
+    texts = []
+    chars = 0
+    read = 0
+    for read, text in page_texts:
+        text = (text or "").strip()
+        if text:
+            texts.append(f"--- Page {read} ---\n{text}")
+            chars += len(text)
+            if chars >= max_chars:
+                break
+    return texts, read
+
+
+def _pdf_pages_pymupdf(pdf_path, max_chars):
+    """Page texts via PyMuPDF (MuPDF's C extractor). Returns (texts, pages_read, total_pages)."""
+    pymupdf = ensure_pymupdf()
+    with pymupdf.open(pdf_path) as doc:
+        total = doc.page_count
+        pages = ((i + 1, doc[i].get_text("text")) for i in range(min(total, PDF_PAGE_LIMIT)))
+        texts, read = _collect_pages(pages, max_chars)
+    return texts, read, total
+
+
+def _pdf_pages_pypdf2(pdf_path, max_chars):
+    """Page texts via PyPDF2 (pure Python). Returns (texts, pages_read, total_pages)."""
     PyPDF2 = ensure_pypdf2()
+    reader = PyPDF2.PdfReader(pdf_path)
+    total = len(reader.pages)
+    pages = ((i + 1, reader.pages[i].extract_text()) for i in range(min(total, PDF_PAGE_LIMIT)))
+    texts, read = _collect_pages(pages, max_chars)
+    return texts, read, total
+
+
+def extract_pdf_text(pdf_path, url="", max_chars=PDF_MAX_CHARS):
+    """Extract text from PDF using PyMuPDF, or PyPDF2 if that fails. Returns markdown string."""
     try:
-        reader = PyPDF2.PdfReader(pdf_path)
-        total = len(reader.pages)
-        page_limit = min(total, 20)
-
-        texts = []
-        for i in range(page_limit):
-            text = reader.pages[i].extract_text()
-            if text and text.strip():
-                texts.append(f"--- Page {i+1} ---\n{text.strip()}")
-
-        filename = Path(pdf_path).name
-        header = f"# {filename}\nSource: {url or pdf_path}\nPages: 1-{page_limit} of {total}\n\n"
-        return header + "\n\n".join(texts) if texts else header + "(No extractable text)"
+        texts, read, total = _pdf_pages_pymupdf(pdf_path, max_chars)
     except Exception as e:
-        return f"# PDF Extract Error\n{e}"
+        log.info(f"PyMuPDF failed on {pdf_path} ({e}), falling back to PyPDF2")
+        try:
+            texts, read, total = _pdf_pages_pypdf2(pdf_path, max_chars)
+        except Exception as e2:
+            return f"# PDF Extract Error\n{e2}"
+
+    filename = Path(pdf_path).name
+    header = f"# {filename}\nSource: {url or pdf_path}\nPages: 1-{read} of {total}\n\n"
+    return header + "\n\n".join(texts) if texts else header + "(No extractable text)"
+
+
+_pdf_parse_sem = asyncio.Semaphore(MAX_PARALLEL_PDF_PARSES)
+
 
+async def async_process_pdf(url, sem, checkpoint=None):
+    """
+    Download one PDF and extract its text. Returns (markdown section, saved path or None).
+    Download and parse are separate stages with their own limits, so one PDF
+    parsing never holds up the next one's download.
+    """
+    cached = _extract_cache.get(url)
+    if cached is not None and os.path.exists(cached[1]):
+        log.info(f"Cached: {url}")
+        if checkpoint is not None:
+            checkpoint.record(url, cached[0], cached[1])
+        return cached
+    async with sem:
+        log.info(f"Downloading PDF: {url}")
+        context = await get_browser_context()
+        async with host_semaphore(url):
+            path, info = await async_download_pdf(url, context)
+    if not path:
+        return f"# PDF Download Failed\nURL: {url}\nError: {info}", None
+    log.info(f"  Saved: {path}")
 
-async def async_extract_pages(urls):
+    async with _pdf_parse_sem:
+        # PDF parsing is CPU-bound - run it on a worker thread so the event loop keeps serving pages
+        text = await asyncio.to_thread(extract_pdf_text, path, url)
+    _remember(url, text, path, checkpoint)
+    return text, path
+
+
+async def async_extract_pages(urls, max_parallel=MAX_PARALLEL_PAGES):
     """Extract content from a list of URLs (async). Returns markdown string."""
     urls = [u.strip() for u in urls if u.strip()]
     if not urls:
@@ -347,80 +957,54 @@ async def async_extract_pages(urls):
     saved_files = []
     t0 = time.time()
 
-    async_playwright = ensure_playwright_async()
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True, args=BROWSER_ARGS)
-        context = await browser.new_context(
-            user_agent=UA, java_script_enabled=True, accept_downloads=True
-        )
-
-        # PDF downloads
-        for url in pdf_urls:
-            log.info(f"Downloading PDF: {url}")
-            path, info = await async_download_pdf(url, context)
-            if path:
-                log.info(f"  Saved: {path}")
-                text = extract_pdf_text(path, url)
-                if text:
-                    sections.append(text)
-                saved_files.append(path)
-            else:
-                sections.append(f"# PDF Download Failed\nURL: {url}\nError: {info}")
-
-        # HTML pages - open in parallel tabs
-        tabs = []
-        for url in html_urls:
-            log.info(f"Loading: {url}")
-            page = await context.new_page()
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=20000)
-                tabs.append((page, url))
-            except Exception as e:
-                sections.append(f"# Navigation Error\nURL: {url}\nError: {e}")
-                try:
-                    await page.close()
-                except Exception:
-                    pass
-
-        # Extract from each tab
-        for page, url in tabs:
-            try:
-                result = await async_wait_and_extract(page, url)
-                title = result.get("title", url)
-                body = result.get("content", "")
-                related = result.get("related", [])
-
-                if "Article unavailable" in title or "window[" in body[:200]:
-                    sections.append(f"# Page Unavailable\nURL: {url}")
-                elif body and len(body) > 50:
-                    section = f"# {title}\nSource: {url}\n\n{body}"
-                    if related:
-                        section += "\n\n## Related Pages\n"
-                        for rel in related[:10]:
-                            rtype = rel.get("type", "")
-                            rtitle = rel.get("title", "")
-                            rslug = rel.get("slug", "")
-                            section += f"- [{rtype}] {rtitle} ({rslug})\n"
-                    sections.append(section)
-                else:
-                    sections.append(f"# Insufficient Content\nURL: {url}\nExtracted < 50 chars.")
-            except Exception as e:
-                sections.append(f"# Extraction Error\nURL: {url}\nError: {e}")
-
-        await context.close()
-        await browser.close()
+    # Pages finished by an earlier, interrupted call for the same URLs
+    prune_checkpoints()
+    checkpoint = RunCheckpoint(urls)
+    results = checkpoint.load()
+    if results:
+        log.info(f"Resuming: {len(results)} of {len(urls)} pages already extracted")
+    pdf_todo = [u for u in pdf_urls if u not in results]
+    html_todo = [u for u in html_urls if u not in results]
+
+    if pdf_todo:
+        # Install once here, not from several worker threads
+        try:
+            ensure_pymupdf()
+        except Exception:
+            ensure_pypdf2()
+
+    # PDFs and HTML pages run side by side. HTML pages are loaded and extracted
+    # end-to-end in their own tabs; each group has its own concurrency limit.
+    # Recently extracted URLs come from _extract_cache, and the browser is only
+    # started when something misses. Each success is checkpointed as it lands.
+    # Sections keep URL order, PDFs first.
+    pdf_sem = asyncio.Semaphore(MAX_PARALLEL_PDFS)
+    html_sem = asyncio.Semaphore(max(1, max_parallel))
+    pdf_results, html_sections = await asyncio.gather(
+        asyncio.gather(*(async_process_pdf(url, pdf_sem, checkpoint) for url in pdf_todo)),
+        asyncio.gather(*(async_process_html(url, html_sem, checkpoint) for url in html_todo)),
+    )
+    results.update(zip(pdf_todo, pdf_results))
+    results.update((url, (section, None)) for url, section in zip(html_todo, html_sections))
+    if checkpoint.done.issuperset(urls):
+        # Nothing left to resume; a repeat call goes back through _extract_cache and its TTL
+        checkpoint.clear()
+    for url in pdf_urls + html_urls:
+        text, path = results[url]
+        if text:
+            sections.append(text)
+        if path:
+            saved_files.append(path)
 
     elapsed = time.time() - t0
-    output = "\n\n---\n\n".join(sections) if sections else "No content extracted."
+    parts = ["\n\n---\n\n".join(sections) if sections else "No content extracted."]
 
     if saved_files:
-        output += "\n\n## Files Saved\n"
-        for f in saved_files:
-            output += f"- {f}\n"
+        parts.append("\n\n## Files Saved\n")
+        parts.extend(f"- {f}\n" for f in saved_files)
 
-    output += f"\n\n[{len(urls)} pages ({len(pdf_urls)} PDF, {len(html_urls)} HTML), {elapsed:.1f}s]"
-    return output
+    parts.append(f"\n\n[{len(urls)} pages ({len(pdf_urls)} PDF, {len(html_urls)} HTML), {elapsed:.1f}s]")
+    return "".join(parts)
 
 
 # ============ FastMCP server ============
@@ -443,11 +1027,22 @@ INSTRUCTIONS = """\
 - Always present: Summary (synthesized) + Sources (labeled OLH/KB/PDF links)
 """
 
-mcp = FastMCP("trend-docs", instructions=INSTRUCTIONS)
+
+@asynccontextmanager
+async def lifespan(server):
+    """Shut the shared browser and HTTP client down with the server."""
+    try:
+        yield {}
+    finally:
+        await close_browser()
+        await close_http_client()
+
+
+mcp = FastMCP("trend-docs", instructions=INSTRUCTIONS, lifespan=lifespan)
 
 
 @mcp.tool()
-def trend_docs_search(query: str, max_results: int = 10) -> str:
+async def trend_docs_search(query: str, max_results: int = 10) -> str:
     """Search Trend Micro documentation via DuckDuckGo.
 
     Returns numbered list of results with title, URL, snippet, and source type
@@ -470,7 +1065,7 @@ def trend_docs_search(query: str, max_results: int = 10) -> str:
         trend_docs_search("Vision One workbench alert API")
     """
     try:
-        results = search_trendmicro(query, max_results)
+        results = await search_trendmicro(query, max_results)
         return format_search_results(results)
     except Exception as e:
         return (
@@ -481,7 +1076,7 @@ def trend_docs_search(query: str, max_results: int = 10) -> str:
 
 
 @mcp.tool()
-async def trend_docs_extract(urls: str, max_pages: int = 5) -> str:
+async def trend_docs_extract(urls: str, max_pages: int = 5, max_parallel: int = MAX_PARALLEL_PAGES) -> str:
     """Extract content from Trend Micro documentation pages.
 
     Reads HTML pages via Playwright (handles JS SPA rendering) and downloads
@@ -492,12 +1087,14 @@ async def trend_docs_extract(urls: str, max_pages: int = 5) -> str:
         urls: Comma-separated URLs to extract. Supports docs.trendmicro.com,
               success.trendmicro.com, and PDF URLs.
         max_pages: Max pages to process (default 5).
+        max_parallel: Max HTML pages loaded at once (default 4). Requests to a
+              single host are additionally capped at 3 in flight.
 
     PDF handling:
         - PDF URLs are auto-detected by .pdf extension
         - Downloaded via Playwright (handles Akamai CDN redirects)
         - Saved to ~/Downloads/
-        - Text extracted with PyPDF2
+        - Text extracted with PyMuPDF (PyPDF2 fallback)
 
     Examples:
         trend_docs_extract("https://docs.trendmicro.com/en-us/documentation/article/trend-vision-one-workbench")
@@ -506,7 +1103,7 @@ async def trend_docs_extract(urls: str, max_pages: int = 5) -> str:
     url_list = [u.strip() for u in urls.split(",") if u.strip()][:max_pages]
     if not url_list:
         return "No URLs provided. Use trend_docs_search first to find page URLs."
-    return await async_extract_pages(url_list)
+    return await async_extract_pages(url_list, max_parallel)
 
 
 if __name__ == "__main__":
@@ -5,19 +5,29 @@ WebFetch returns empty shells on these sites. Playwright is the ONLY way to read
 Usage: python executor.py --urls "URL1,URL2" or python executor.py "slug-name"
 Workflow: WebSearch finds URLs -> this script extracts them -> Claude summarizes.
 ~25s/page (5s browser launch + 20s SPA hydration). Parallel tabs for multi-page.
+`--daemon` keeps one Chromium running between calls so later runs skip the launch.
+Without it, Chromium runs on a reusable profile (~/.cache/trend-docs/profile) whose
+HTTP and code caches stay warm between runs.
 
-PDF support: Detects .pdf URLs, downloads via Playwright (handles Akamai cookie
-redirects that break curl with exit code 47), saves to ~/Downloads, extracts text
-with PyPDF2.
+PDF support: Detects .pdf URLs and downloads them over plain HTTP when httpx is
+installed (it keeps Akamai's cookie across the redirect that breaks curl with
+exit code 47), falling back to Playwright; saves to ~/Downloads, extracts text
+with PyMuPDF (PyPDF2 fallback).
 
 Lessons learned:
 - "networkidle" adds 10-15s for trackers; use "domcontentloaded" + selector wait
+- Images, fonts, media and tracker scripts are aborted at the context; the
+  extractors only read DOM text
+- Pages whose article is already in the server-rendered HTML are read with one
+  plain GET (httpx + selectolax, both optional); hosts that serve only the SPA
+  shell are remembered for a day and go straight to the browser
 - Blind sleep loops (2s+3s+5s) waste 10s/page; wait for .main-content instead
 - OLH uses .main-content, KB uses main.article-page - different extractors
 - Pipe chars in table cells replaced with / to avoid breaking markdown tables
-- One 2s retry if content <100 chars catches slow hydration edge cases
+- wait_for_function on the content text replaces fixed post-selector sleeps; one
+  2s retry only if content is still <100 chars after that
 - docs.trendmicro.com PDFs use Akamai CDN that sets ew-request cookie + redirect
-  loop; curl fails with exit 47 (max redirects). Playwright handles cookies natively.
+  loop; curl fails with exit 47 (max redirects). httpx and Playwright both keep the cookie.
 - ohc.blob.core.windows.net PDFs work with curl (direct Azure blob, no Akamai)
 """
 
@@ -30,7 +40,13 @@ import io
 import time
 import hashlib
 import json
+import shutil
+import socket
+import urllib.request
 from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Force UTF-8 output on Windows
 if sys.stdout.encoding != 'utf-8':
@@ -56,6 +72,18 @@ sync_playwright = ensure_playwright()
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 log = logging.getLogger("trend-docs")
 
+# httpx and selectolax are optional: with both installed, server-rendered pages
+# are extracted without a browser (see try_http_fast).
+try:
+    import httpx
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+except ImportError:
+    httpx = None
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 # ============ Constants ============
 
 OLH_BASE = "https://docs.trendmicro.com/en-us/documentation/article/"
@@ -68,13 +96,185 @@ BROWSER_ARGS = [
     "--no-first-run",
     "--disable-sync",
 ]
+# Requests aborted before they reach the network - extraction only reads text.
+# Stylesheets stay allowed, as in the MCP server: the SPAs may wait on CSS
+# before rendering content, and --check-cache hashes innerText, which depends
+# on CSS visibility.
+BLOCKED_RESOURCE_TYPES = frozenset(("image", "font", "media"))
+TRACKER_HOSTS = (
+    "adobedtm.com",
+    "omtrdc.net",
+    "go-mpulse.net",
+    "akstat.io",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "doubleclick.net",
+    "segment.io",
+    "segment.com",
+)
+
+
+# ============ Browser daemon ============
+
+# `--daemon` starts a background Chromium that later invocations attach to over
+# CDP instead of launching their own (~5s each). Each call still gets its own
+# context, so cookies and state don't carry over. The state file holds
+# {"pid", "endpoint"}; `--stop-daemon` deletes it and the daemon shuts down.
+DAEMON_FILE = Path.home() / ".cache" / "trend-docs" / "cdp.json"
+DAEMON_START_TIMEOUT = 30
+
+
+def read_daemon_state():
+    """Return the daemon's {"pid", "endpoint"} state, or None if no daemon is registered."""
+    try:
+        return json.loads(DAEMON_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def daemon_alive(endpoint):
+    """True if a browser is answering CDP requests at endpoint."""
+    try:
+        with urllib.request.urlopen(endpoint + "/json/version", timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+def block_resources(context):
+    """Abort asset and tracker requests for every page in the context."""
+
+    def handler(route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or host.endswith(TRACKER_HOSTS):
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", handler)
+
+
+# On-disk profile for in-process launches. Bump PROFILE_VERSION to discard
+# profiles written with incompatible settings.
+PROFILE_DIR = Path.home() / ".cache" / "trend-docs" / "profile"
+PROFILE_VERSION = "1"
+
+
+def _prepare_profile():
+    marker = PROFILE_DIR / ".trend-docs-version"
+    try:
+        version = marker.read_text(encoding="utf-8").strip()
+    except OSError:
+        version = None
+    if version != PROFILE_VERSION:
+        shutil.rmtree(PROFILE_DIR, ignore_errors=True)
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        marker.write_text(PROFILE_VERSION, encoding="utf-8")
+
+
+def open_context(p, **kwargs):
+    """Browser context for one run; release it with close_context().
+    Attaches to the --daemon browser if it is running (a fresh context, so
+    nothing carries over between runs). Otherwise launches Chromium on
+    PROFILE_DIR so its disk caches are warm, or on a throwaway profile when
+    another run holds that one."""
+    kwargs.update(user_agent=UA, java_script_enabled=True)
+    state = read_daemon_state()
+    if state:
+        try:
+            browser = p.chromium.connect_over_cdp(state["endpoint"], timeout=3000)
+            log.info(f"[daemon] attached to {state['endpoint']}")
+            return browser.new_context(**kwargs)
+        except Exception as e:
+            log.info(f"[daemon] unreachable, launching browser ({e})")
+    _prepare_profile()
+    try:
+        return p.chromium.launch_persistent_context(str(PROFILE_DIR), headless=True,
+                                                    args=BROWSER_ARGS, **kwargs)
+    except Exception as e:
+        log.info(f"[profile] in use, launching without it ({e})")
+        return p.chromium.launch(headless=True, args=BROWSER_ARGS).new_context(**kwargs)
+
+
+def close_context(context):
+    """Close a context from open_context() and the browser it came with (for an
+    attached daemon browser that only disconnects)."""
+    browser = context.browser  # None for a persistent context
+    context.close()
+    if browser is not None:
+        browser.close()
+
+
+def serve_daemon():
+    """Run the shared browser until --stop-daemon removes the state file."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True,
+                                    args=BROWSER_ARGS + [f"--remote-debugging-port={port}"])
+        DAEMON_FILE.parent.mkdir(parents=True, exist_ok=True)
+        DAEMON_FILE.write_text(json.dumps({"pid": os.getpid(), "endpoint": f"http://127.0.0.1:{port}"}),
+                               encoding="utf-8")
+        try:
+            while DAEMON_FILE.exists():
+                time.sleep(1)
+        finally:
+            browser.close()
+            state = read_daemon_state()
+            if state and state.get("pid") == os.getpid():
+                DAEMON_FILE.unlink()
+
+
+def start_daemon():
+    """Start serve_daemon() in a detached process and wait until it is reachable."""
+    import subprocess
+    state = read_daemon_state()
+    if state and daemon_alive(state["endpoint"]):
+        print(f"Browser daemon already running (pid {state['pid']}, {state['endpoint']})")
+        return
+    if state:
+        DAEMON_FILE.unlink()  # left behind by a daemon that died
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen([sys.executable, str(Path(__file__).resolve()), "--serve-daemon"],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, **kwargs)
+    deadline = time.time() + DAEMON_START_TIMEOUT
+    while time.time() < deadline:
+        state = read_daemon_state()
+        if state and daemon_alive(state["endpoint"]):
+            print(f"Browser daemon started (pid {state['pid']}, {state['endpoint']})")
+            return
+        time.sleep(0.2)
+    print(f"Browser daemon did not start within {DAEMON_START_TIMEOUT}s")
+    sys.exit(1)
+
+
+def stop_daemon():
+    """Ask the running daemon to close its browser and exit."""
+    if read_daemon_state() is None:
+        print("No browser daemon running.")
+        return
+    DAEMON_FILE.unlink()
+    print("Browser daemon stopping.")
 
 
 # ============ Cache ============
 
 CACHE_DIR = Path(__file__).parent / "cache"
 CACHE_DIR.mkdir(exist_ok=True)
-CACHE_MAX_AGE = 2592000  # 30 days (docs rarely change)
+CACHE_MAX_AGE = 2592000  # 30 days (docs rarely change) - hard limit for every entry
+# Entries with an ETag/Last-Modified (stored only from the plain-HTTP fetch) are
+# revalidated with a conditional HEAD once their last check is this old
+# (override with --max-age); a 304 restarts that clock but not CACHE_MAX_AGE.
+# Entries without validators are served until CACHE_MAX_AGE.
+CACHE_REVALIDATE_OLH = 86400  # 1 day
+CACHE_REVALIDATE_KB = 604800  # 7 days
 SLUG_INDEX_PATH = Path(__file__).parent / "doc-slugs.yaml"
 
 
@@ -86,28 +286,106 @@ def url_to_cache_key(url):
     return hashlib.md5(url.encode()).hexdigest()[:16] + ".md"
 
 
-def cache_get(url):
-    """Return cached content if fresh, else None."""
-    key = url_to_cache_key(url)
-    path = CACHE_DIR / key
-    if path.exists():
-        age = time.time() - path.stat().st_mtime
-        if age < CACHE_MAX_AGE:
-            content = path.read_text(encoding="utf-8")
+def response_validators(headers):
+    """ETag / Last-Modified from a response's headers (lower-case keys), for cache_put."""
+    if not headers:
+        return None
+    validators = {k: headers[k] for k in ("etag", "last-modified") if headers.get(k)}
+    return validators or None
+
+
+def _read_validators(key):
+    """Validators from the .meta sidecar, plus "checked": time of the last 304 if any."""
+    try:
+        return json.loads((CACHE_DIR / (key + ".meta")).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _revalidate(client, url, validators):
+    """Conditional HEAD for a cached page. True if the server answers 304 Not Modified."""
+    headers = {}
+    if "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if "last-modified" in validators:
+        headers["If-Modified-Since"] = validators["last-modified"]
+    try:
+        return client.head(url, headers=headers).status_code == 304
+    except httpx.HTTPError:
+        return False
+
+
+def cache_lookup(urls, max_age=None):
+    """Split urls into ({url: cached content}, [urls to fetch]).
+    Entries fetched or last revalidated less than max_age ago (default:
+    CACHE_REVALIDATE_OLH/_KB) are served as-is. Older ones with validators are
+    revalidated in parallel, one conditional HEAD each. Nothing fetched more
+    than CACHE_MAX_AGE ago is served, 304 or not."""
+    hits = {}
+    misses = []
+    revalidate = []
+    now = time.time()
+    for url in urls:
+        key = url_to_cache_key(url)
+        path = CACHE_DIR / key
+        try:
+            fetched = path.stat().st_mtime
+        except FileNotFoundError:
+            misses.append(url)
+            continue
+        age = now - fetched
+        if age >= CACHE_MAX_AGE:
+            log.info(f"  [cache STALE] {key} ({age:.0f}s old, max {CACHE_MAX_AGE}s)")
+            misses.append(url)
+            continue
+        limit = max_age if max_age is not None else (
+            CACHE_REVALIDATE_OLH if is_olh(url) else CACHE_REVALIDATE_KB)
+        validators = _read_validators(key)
+        checked = validators.get("checked", fetched) if validators else fetched
+        if now - checked < limit:
             log.info(f"  [cache HIT] {key} ({age:.0f}s old)")
-            return content
+            hits[url] = path.read_text(encoding="utf-8")
+        elif validators and httpx is not None:
+            revalidate.append((url, validators))
+        elif max_age is None:
+            log.info(f"  [cache HIT] {key} ({age:.0f}s old, no validators)")
+            hits[url] = path.read_text(encoding="utf-8")
         else:
-            log.info(f"  [cache STALE] {key} ({age:.0f}s old, max {CACHE_MAX_AGE}s)")
-    return None
+            log.info(f"  [cache STALE] {key} ({age:.0f}s old)")
+            misses.append(url)
+
+    if revalidate:
+        with http_client() as client, \
+                ThreadPoolExecutor(max_workers=min(HTTP_PROBE_WORKERS, len(revalidate))) as pool:
+            fresh = list(pool.map(lambda item: _revalidate(client, *item), revalidate))
+        for (url, validators), not_modified in zip(revalidate, fresh):
+            key = url_to_cache_key(url)
+            path = CACHE_DIR / key
+            if not_modified:
+                # Restart the revalidation clock; the file's mtime keeps the fetch time
+                validators["checked"] = now
+                (CACHE_DIR / (key + ".meta")).write_text(json.dumps(validators), encoding="utf-8")
+                log.info(f"  [cache REVALIDATED] {key}")
+                hits[url] = path.read_text(encoding="utf-8")
+            else:
+                log.info(f"  [cache CHANGED] {key}")
+                misses.append(url)
+    return hits, misses
 
 
-def cache_put(url, content):
-    """Write content to cache, with content hash sidecar for freshness checks."""
+def cache_put(url, content, validators=None):
+    """Write content to cache, with content hash sidecar for freshness checks
+    and, for a plain-HTTP fetch that had them, ETag/Last-Modified for revalidation."""
     key = url_to_cache_key(url)
     path = CACHE_DIR / key
     path.write_text(content, encoding="utf-8")
     h = hashlib.md5(content.encode("utf-8")).hexdigest()
     (CACHE_DIR / (key + ".hash")).write_text(h, encoding="utf-8")
+    meta_path = CACHE_DIR / (key + ".meta")
+    if validators:
+        meta_path.write_text(json.dumps(validators), encoding="utf-8")
+    elif meta_path.exists():
+        meta_path.unlink()
     log.info(f"  [cache WRITE] {key} ({len(content)} chars, hash={h[:8]})")
 
 
@@ -182,8 +460,9 @@ def check_cache_freshness(topics=None, refresh=False):
     errors = []
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True, args=BROWSER_ARGS)
-        context = browser.new_context(user_agent=UA, java_script_enabled=True)
+        context = open_context(p)
+        context.add_init_script(script=EXTRACT_INIT_JS)
+        block_resources(context)
 
         for name, url, stored_ihash in pages_to_check:
             try:
@@ -191,9 +470,9 @@ def check_cache_freshness(topics=None, refresh=False):
                 page.goto(url, wait_until="domcontentloaded", timeout=15000)
                 try:
                     page.wait_for_selector(".main-content", timeout=8000)
+                    page.wait_for_function(CONTENT_READY_JS, arg=".main-content", timeout=3000)
                 except Exception:
                     pass
-                page.wait_for_timeout(500)
 
                 text = page.evaluate(HASH_JS)
                 page.close()
@@ -235,7 +514,7 @@ def check_cache_freshness(topics=None, refresh=False):
                     cache_put(url, section)
                     print(f"  [REFRESHED] {name}")
 
-        browser.close()
+        close_context(context)
 
     # Summary
     print(f"\n{'='*50}")
@@ -300,12 +579,15 @@ def resolve_topic(topic):
 
 # ============ Helpers ============
 
+_SLUG_RE = re.compile(r"[a-z0-9-]+\Z")
+
+
 def is_url(text):
-    return text.startswith("http://") or text.startswith("https://")
+    return text.startswith(("http://", "https://"))
 
 
 def is_slug(text):
-    return re.match(r"^[a-z0-9-]+$", text) and len(text) > 10
+    return len(text) > 10 and _SLUG_RE.match(text) is not None
 
 
 def is_olh(url):
@@ -323,6 +605,24 @@ def get_downloads_dir():
     return dl
 
 
+def ensure_pymupdf():
+    """Auto-install PyMuPDF if missing. Returns the pymupdf (formerly fitz) module."""
+    try:
+        import pymupdf
+        return pymupdf
+    except ImportError:
+        pass
+    try:
+        import fitz  # PyMuPDF < 1.24.3
+        return fitz
+    except ImportError:
+        import subprocess
+        log.info("[trend-docs] Installing PyMuPDF...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "pymupdf", "-q"])
+        import pymupdf
+        return pymupdf
+
+
 def ensure_pypdf2():
     """Auto-install PyPDF2 if missing."""
     try:
@@ -450,45 +750,346 @@ KB_EXTRACT_JS = """() => {
 }"""
 
 
+# ============ HTTP fast path ============
+
+# Minimum converted text for a plain GET to count as the real article
+HTTP_MIN_CONTENT = 1000
+HTTP_PROBE_WORKERS = 8
+# Hosts whose HTML lacked the article: {host: unix time}. Skipped for a day.
+HTTP_PROBE_PATH = CACHE_DIR / "http-probe.json"
+HTTP_PROBE_MAX_AGE = 86400
+
+# Python port of the toMd walker in the extraction JS (same output rules)
+_MD_SKIP_TAGS = frozenset(("nav", "header", "footer", "script", "style", "noscript"))
+_MD_TABLE_PARTS = frozenset(("thead", "tbody", "tfoot", "tr", "th", "td"))
+_MD_HEADINGS = {f"h{n}": "#" * n + " " for n in range(1, 7)}
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def _table_to_md(node, kids):
+    rows = node.css("tr")
+    if not rows:
+        return kids()
+    parts = ["\n"]
+    for i, row in enumerate(rows):
+        cells = [c.text(deep=True).strip().replace("|", "/") for c in row.css("th, td")]
+        parts.append("| " + " | ".join(cells) + " |\n")
+        if i == 0:
+            parts.append("| " + " | ".join(["---"] * len(cells)) + " |\n")
+    parts.append("\n")
+    return "".join(parts)
+
+
+def tree_to_md(node, base_url):
+    """Convert a selectolax node to Markdown."""
+    if node.is_text_node:
+        return node.text_content or ""
+    if not node.is_element_node:
+        return ""
+    tag = node.tag
+    if tag in _MD_SKIP_TAGS:
+        return ""
+    if tag == "br":
+        return "\n"
+    if tag in ("pre", "code"):
+        return "```\n" + node.text(deep=True).strip() + "\n```\n\n"
+    if tag == "table":
+        return _table_to_md(node, lambda: _children_to_md(node, base_url))
+    if tag in _MD_TABLE_PARTS:
+        return ""
+
+    kids = _children_to_md(node, base_url)
+    heading = _MD_HEADINGS.get(tag)
+    if heading:
+        return "\n" + heading + kids.strip() + "\n\n"
+    if tag == "p":
+        return kids.strip() + "\n\n"
+    if tag == "li":
+        return "- " + kids.strip() + "\n"
+    if tag in ("ul", "ol"):
+        return "\n" + kids + "\n"
+    if tag == "a":
+        href = node.attributes.get("href")
+        if href is not None:
+            return "[" + kids.strip() + "](" + urljoin(base_url, href) + ")"
+    elif tag in ("strong", "b"):
+        return "**" + kids.strip() + "**"
+    elif tag in ("em", "i"):
+        return "*" + kids.strip() + "*"
+    return kids
+
+
+def _children_to_md(node, base_url):
+    return "".join([tree_to_md(child, base_url) for child in node.iter(include_text=True)])
+
+
+def html_to_result(html, url, base_url=None):
+    """Extract title + Markdown content from a page's HTML, like the JS extractors do.
+    Links resolve against base_url (default: url)."""
+    tree = LexborHTMLParser(html)
+    title = tree.css_first("title")
+    title = " ".join(title.text().split()) if title is not None else url
+    root = tree.css_first(".main-content" if is_olh(url) else "main.article-page, main")
+    if root is None:
+        body = tree.body
+        content = body.text(deep=True).strip()[:5000] if body is not None else ""
+        return {"content": content, "title": title, "url": url, "related": []}
+    for menu in root.css(".article-menu"):
+        menu.decompose()
+    content = _BLANK_LINES_RE.sub("\n\n", tree_to_md(root, base_url or url)).strip()
+    return {"content": content, "title": title, "url": url, "related": []}
+
+
+def _load_probe_misses():
+    try:
+        misses = json.loads(HTTP_PROBE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    now = time.time()
+    return {host: ts for host, ts in misses.items() if now - ts < HTTP_PROBE_MAX_AGE}
+
+
+def http_client():
+    """httpx client with the browser's UA (HTTP/2 when the h2 package is installed)."""
+    kwargs = {"headers": {"User-Agent": UA}, "timeout": 15, "follow_redirects": True}
+    try:
+        return httpx.Client(http2=True, **kwargs)
+    except ImportError:
+        return httpx.Client(**kwargs)
+
+
+def try_http_fast(client, url):
+    """GET a page and extract it without a browser. Returns a result dict, or None
+    if the server-rendered HTML doesn't hold the article (SPA shell, dead page)."""
+    try:
+        resp = client.get(url)
+    except httpx.HTTPError:
+        return None
+    if resp.status_code != 200 or "html" not in resp.headers.get("content-type", ""):
+        return None
+    result = html_to_result(resp.text, url)
+    result["validators"] = response_validators(resp.headers)
+    body = result["content"]
+    if (len(body) < HTTP_MIN_CONTENT or "window[" in body[:200]
+            or "Article unavailable" in result["title"]):
+        return None
+    return result
+
+
+def fetch_static_pages(urls):
+    """Try each URL over plain HTTP in parallel. Returns {url: result} for the pages
+    that didn't need a browser; the rest are left for Playwright."""
+    if httpx is None or LexborHTMLParser is None or not urls:
+        return {}
+    misses = _load_probe_misses()
+    probe = [u for u in urls if urlsplit(u).hostname not in misses]
+    if not probe:
+        return {}
+    with http_client() as client, ThreadPoolExecutor(max_workers=min(HTTP_PROBE_WORKERS, len(probe))) as pool:
+        results = dict(zip(probe, pool.map(lambda u: try_http_fast(client, u), probe)))
+
+    hits = {url: r for url, r in results.items() if r is not None}
+    hit_hosts = {urlsplit(u).hostname for u in hits}
+    now = time.time()
+    for url, r in results.items():
+        host = urlsplit(url).hostname
+        if r is None and host not in hit_hosts:
+            misses[host] = now
+    try:
+        HTTP_PROBE_PATH.write_text(json.dumps(misses), encoding="utf-8")
+    except OSError:
+        pass
+    return hits
+
+
+# Installed on each context so every page defines the extractors itself;
+# each extract then sends a one-line call instead of the full source.
+# __trendExtractReady folds the content-ready check and the extract into one
+# call, so polling a tab costs one round trip and the poll that finds it ready
+# also brings back its content (or, for the py extractor, its HTML).
+EXTRACT_READY_JS = """(sel, olh, html, force) => {
+    const el = document.querySelector(sel);
+    if (!force && !(el && el.textContent.trim().length > 100)) return null;
+    if (html) return {html: document.documentElement.outerHTML, base: location.href};
+    return olh ? window.__trendExtractOlh() : window.__trendExtractKb();
+}"""
+EXTRACT_INIT_JS = (
+    f"window.__trendExtractOlh = {OLH_EXTRACT_JS};\n"
+    f"window.__trendExtractKb = {KB_EXTRACT_JS};\n"
+    f"window.__trendExtractReady = {EXTRACT_READY_JS};\n"
+)
+OLH_CALL_JS = "() => window.__trendExtractOlh ? window.__trendExtractOlh() : null"
+KB_CALL_JS = "() => window.__trendExtractKb ? window.__trendExtractKb() : null"
+# false (not null) when the init script is missing from the document
+READY_CALL_JS = "(a) => window.__trendExtractReady ? window.__trendExtractReady(...a) : false"
+
+
 # ============ Extraction ============
 
-def extract_page(page_obj, url):
+# "js" converts to Markdown inside the page; "py" pulls the rendered HTML with
+# page.content() and converts it with tree_to_md, keeping that work out of the
+# renderer. The two don't produce identical Markdown yet (the OLH walker keeps
+# nav/header/footer text, the KB walker has no em/i and renders empty tables
+# differently), so "py" is opt-in.
+EXTRACTORS = ("js", "py")
+DEFAULT_EXTRACTOR = "js"
+
+
+def extract_page(page_obj, url, extractor="js"):
     """Extract content from a loaded Playwright page."""
-    js = OLH_EXTRACT_JS if is_olh(url) else KB_EXTRACT_JS
+    olh = is_olh(url)
     try:
-        result = page_obj.evaluate(js)
+        if extractor == "py":
+            return html_to_result(page_obj.content(), url, page_obj.url)
+        result = page_obj.evaluate(OLH_CALL_JS if olh else KB_CALL_JS)
+        if result is None:
+            # Init script didn't run in this document - send the full extractor
+            result = page_obj.evaluate(OLH_EXTRACT_JS if olh else KB_EXTRACT_JS)
         result["url"] = url
         return result
     except Exception as e:
         return {"content": f"Error extracting: {e}", "title": url, "url": url, "related": []}
 
 
+def content_selector(url):
+    return ".main-content" if is_olh(url) else "main.article-page, main"
+
+
+# True once the content container holds real text (not just the SPA shell)
+CONTENT_READY_JS = """(sel) => {
+    const el = document.querySelector(sel);
+    return !!el && el.textContent.trim().length > 100;
+}"""
+
+
 def wait_and_extract(page_obj, url):
     """Wait for content to render on an already-navigating page, then extract."""
-    content_sel = ".main-content" if is_olh(url) else "main.article-page, main"
+    content_sel = content_selector(url)
     try:
         page_obj.wait_for_selector(content_sel, timeout=10000)
     except Exception:
         pass
-    page_obj.wait_for_timeout(500)
+    # Returns the moment the container has text, instead of a fixed 500ms sleep
+    try:
+        page_obj.wait_for_function(CONTENT_READY_JS, arg=content_sel, timeout=3000)
+        rendered = True
+    except Exception:
+        rendered = False
     result = extract_page(page_obj, url)
     # Retry once if SPA shell not rendered
-    if not result["content"] or len(result["content"]) < 100 or "window[" in result["content"][:200]:
+    if not rendered and (not result["content"] or len(result["content"]) < 100
+                         or "window[" in result["content"][:200]):
         page_obj.wait_for_timeout(2000)
         result = extract_page(page_obj, url)
     return result
 
 
+TAB_READY_TIMEOUT = 10  # seconds, same as wait_and_extract's selector wait
+TAB_POLL_MS = 250
+MAX_OPEN_TABS = 4  # each hydrating tab holds a renderer (~200MB)
+
+
+def _poll_tab(page_obj, url, extractor, force):
+    """Extract result if the tab's content has rendered (or force is set), else None."""
+    sel = content_selector(url)
+    raw = page_obj.evaluate(READY_CALL_JS, [sel, is_olh(url), extractor == "py", force])
+    if raw is False:
+        if force or page_obj.evaluate(CONTENT_READY_JS, sel):
+            return extract_page(page_obj, url, extractor)
+        return None
+    if raw is None:
+        return None
+    if extractor == "py":
+        return html_to_result(raw["html"], url, raw["base"])
+    raw["url"] = url
+    return raw
+
+
+def extract_tabs(context, urls, max_open=MAX_OPEN_TABS, extractor="js"):
+    """Load and extract urls with at most max_open tabs alive at once.
+    Each tab is extracted as soon as its content has rendered (or after
+    TAB_READY_TIMEOUT) and closed right away, and the next URL takes its slot:
+    memory stays flat however many pages are asked for, and a slow page
+    doesn't hold up the rest. The sync API can't wait on several pages from
+    threads, so open tabs are polled in turn.
+    Returns [result or None] in URL order."""
+    results = [None] * len(urls)
+    queue = deque(enumerate(urls))
+    active = []  # (index, page, url, deadline)
+    while queue or active:
+        while queue and len(active) < max_open:
+            i, url = queue.popleft()
+            log.info(f"[tab {i+1}] loading {url}")
+            page = context.new_page()
+            try:
+                page.goto(url, wait_until="domcontentloaded", timeout=20000)
+            except Exception as e:
+                log.info(f"  [{i+1}] ERROR: {e}")
+                page.close()
+                continue
+            active.append((i, page, url, time.time() + TAB_READY_TIMEOUT))
+        waiting = []
+        for tab in active:
+            i, page, url, deadline = tab
+            # Past the deadline take whatever is there, like wait_and_extract after its timeout
+            force = time.time() >= deadline
+            try:
+                result = _poll_tab(page, url, extractor, force)
+            except Exception as e:
+                # Mid-navigation: try again next round
+                result = {"content": f"Error extracting: {e}", "title": url, "url": url,
+                          "related": []} if force else None
+            if result is not None:
+                results[i] = result
+                page.close()
+            else:
+                waiting.append(tab)
+        active = waiting
+        if active and (len(active) >= max_open or not queue):
+            active[0][1].wait_for_timeout(TAB_POLL_MS)
+    return results
+
+
 # ============ PDF Download + Extract ============
 
-def download_pdf_playwright(url, context):
-    """Download PDF via Playwright (handles Akamai cookie redirects that break curl).
-    Saves to ~/Downloads, returns (local_path, filename) or (None, error_msg)."""
-    downloads_dir = get_downloads_dir()
+def _pdf_save_path(url):
     filename = url.split("/")[-1].split("?")[0]
     if not filename.endswith(".pdf"):
         filename += ".pdf"
-    save_path = downloads_dir / filename
+    return get_downloads_dir() / filename, filename
+
+
+def download_pdf_http(client, url):
+    """Download PDF with plain HTTP, streamed to ~/Downloads without a browser.
+    The client keeps cookies across redirects, so Akamai's ew-request cookie
+    survives the redirect that loops curl. Returns (local_path, filename) or
+    (None, error_msg); on failure download_pdf_playwright is the fallback."""
+    save_path, filename = _pdf_save_path(url)
+    part_path = save_path.with_name(save_path.name + ".part")
+    try:
+        with client.stream("GET", url) as resp:
+            if resp.status_code != 200:
+                return None, f"HTTP {resp.status_code}"
+            chunks = resp.iter_bytes(1 << 16)
+            first = next(chunks, b"")
+            if not first.startswith(b"%PDF"):
+                return None, "response is not a PDF"
+            with open(part_path, "wb") as f:
+                f.write(first)
+                for chunk in chunks:
+                    f.write(chunk)
+        os.replace(part_path, save_path)
+        return str(save_path), filename
+    except (httpx.HTTPError, OSError) as e:
+        if part_path.exists():
+            part_path.unlink()
+        return None, f"Download failed: {e}"
+
+
+def download_pdf_playwright(url, context):
+    """Download PDF via Playwright (handles Akamai cookie redirects that break curl).
+    Saves to ~/Downloads, returns (local_path, filename) or (None, error_msg)."""
+    save_path, filename = _pdf_save_path(url)
 
     try:
         page = context.new_page()
@@ -517,37 +1118,88 @@ def download_pdf_playwright(url, context):
     return None, "Download failed: unknown error"
 
 
-def extract_pdf_text(pdf_path, pages=None):
-    """Extract text from PDF using PyPDF2. Returns markdown string."""
+# --pages values: "N" or "N-M", 1-based and inclusive
+_PAGE_SPEC_RE = re.compile(r"[1-9]\d*(?:-[1-9]\d*)?\Z")
+
+
+def _page_range(pages, total):
+    """0-based [start, end) for a page spec like "1-5" or "3"; None means the first 20."""
+    if pages:
+        parts = pages.split("-")
+        start = int(parts[0]) - 1
+        end = int(parts[1]) if len(parts) > 1 else start + 1
+    else:
+        start, end = 0, 20  # Cap at 20 pages by default
+    return start, min(end, total)
+
+
+# Page ranges at least this long are split across worker processes. Each
+# worker re-imports this script and reopens the PDF, which costs more than
+# PyMuPDF needs for a few dozen pages, so short ranges stay in-process.
+PDF_PARALLEL_MIN_PAGES = 64
+PDF_PAGES_PER_WORKER = 32
+
+
+def _pymupdf_text_range(pdf_path, start, end):
+    """(page_number, text) for pages [start, end). Module-level so worker processes can run it."""
+    pymupdf = ensure_pymupdf()
+    with pymupdf.open(pdf_path) as doc:
+        return [(i + 1, doc[i].get_text("text")) for i in range(start, end)]
+
+
+def _pdf_pages_pymupdf(pdf_path, pages):
+    """Page texts via PyMuPDF (MuPDF's C extractor). Returns (texts, start, end, total)."""
+    pymupdf = ensure_pymupdf()
+    with pymupdf.open(pdf_path) as doc:
+        total = doc.page_count
+    start, end = _page_range(pages, total)
+    count = end - start
+    workers = min(os.cpu_count() or 1, -(-count // PDF_PAGES_PER_WORKER))
+    if count >= PDF_PARALLEL_MIN_PAGES and workers > 1:
+        # Contiguous chunks, one per worker, joined back in page order
+        bounds = [start + count * k // workers for k in range(workers + 1)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = pool.map(_pymupdf_text_range, [pdf_path] * workers, bounds[:-1], bounds[1:])
+                return [t for part in parts for t in part], start, end, total
+        except (OSError, RuntimeError) as e:  # no process support; BrokenProcessPool is a RuntimeError
+            log.info(f"  PDF worker pool failed ({e}), extracting in-process")
+    return _pymupdf_text_range(pdf_path, start, end), start, end, total
+
+
+def _pdf_pages_pypdf2(pdf_path, pages):
+    """Page texts via PyPDF2 (pure Python). Returns (texts, start, end, total)."""
     PyPDF2 = ensure_pypdf2()
-    try:
-        reader = PyPDF2.PdfReader(pdf_path)
-        total = len(reader.pages)
-        # Parse page range like "1-5" or "3" or None (all)
-        if pages:
-            parts = pages.split("-")
-            start = int(parts[0]) - 1
-            end = int(parts[1]) if len(parts) > 1 else start + 1
-        else:
-            start, end = 0, min(total, 20)  # Cap at 20 pages by default
+    reader = PyPDF2.PdfReader(pdf_path)
+    total = len(reader.pages)
+    start, end = _page_range(pages, total)
+    texts = [(i + 1, reader.pages[i].extract_text()) for i in range(start, end)]
+    return texts, start, end, total
 
-        texts = []
-        for i in range(start, min(end, total)):
-            text = reader.pages[i].extract_text()
-            if text and text.strip():
-                texts.append(f"--- Page {i+1} ---\n{text.strip()}")
 
-        filename = Path(pdf_path).name
-        header = f"# {filename}\nSource: {pdf_path}\nPages: {start+1}-{min(end, total)} of {total}\n\n"
-        return header + "\n\n".join(texts) if texts else header + "(No extractable text)"
+def extract_pdf_text(pdf_path, pages=None):
+    """Extract text from PDF using PyMuPDF, or PyPDF2 if that fails. Returns markdown string."""
+    try:
+        texts, start, end, total = _pdf_pages_pymupdf(pdf_path, pages)
     except Exception as e:
-        return f"# PDF Extract Error\n{e}"
+        log.info(f"  PyMuPDF failed on {pdf_path} ({e}), falling back to PyPDF2")
+        try:
+            texts, start, end, total = _pdf_pages_pypdf2(pdf_path, pages)
+        except Exception as e2:
+            return f"# PDF Extract Error\n{e2}"
+
+    texts = [f"--- Page {n} ---\n{text.strip()}" for n, text in texts if text and text.strip()]
+    filename = Path(pdf_path).name
+    header = f"# {filename}\nSource: {pdf_path}\nPages: {start+1}-{end} of {total}\n\n"
+    return header + "\n\n".join(texts) if texts else header + "(No extractable text)"
 
 
 # ============ Main ============
 
-def run_batch(urls, max_pages=10, use_cache=True):
-    """Extract multiple URLs in parallel tabs within a single browser."""
+def run_batch(urls, max_pages=10, use_cache=True, max_age=None, extractor=DEFAULT_EXTRACTOR,
+              pdf_pages=None):
+    """Extract multiple URLs in parallel tabs within a single browser.
+    pdf_pages is a page spec for every PDF ("1-200"); None means the first 20."""
     urls = [u.strip() for u in urls if u.strip()][:max_pages]
     if not urls:
         print("No URLs provided.")
@@ -557,82 +1209,115 @@ def run_batch(urls, max_pages=10, use_cache=True):
     pdf_urls = [u for u in urls if is_pdf(u)]
     html_urls = [u for u in urls if not is_pdf(u)]
 
-    output_sections = []
+    # Sections are written to one buffer as they are produced
+    out = io.StringIO()
+    returned = 0
     t0 = time.time()
     cache_hits = 0
 
+    def add_section(section):
+        nonlocal returned
+        if returned:
+            out.write("\n\n---\n\n")
+        out.write(section)
+        returned += 1
+
     # Check cache for HTML URLs first
-    uncached_html = []
     if use_cache:
+        cached, uncached_html = cache_lookup(html_urls, max_age)
         for url in html_urls:
-            cached = cache_get(url)
-            if cached:
-                output_sections.append(cached)
-                cache_hits += 1
-            else:
-                uncached_html.append(url)
+            if url in cached:
+                add_section(cached[url])
+        cache_hits = len(cached)
     else:
         uncached_html = html_urls
 
-    # Only launch browser if we have uncached HTML or PDF URLs
-    if uncached_html or pdf_urls:
+    # Server-rendered pages are read over plain HTTP; only the rest need tabs
+    static = fetch_static_pages(uncached_html)
+    if static:
+        uncached_html = [u for u in uncached_html if u not in static]
+        for url, result in static.items():
+            log.info(f"[http] {url}")
+            section = f"# {result['title']}\nSource: {url}\n\n{result['content']}"
+            add_section(section)
+            if use_cache:
+                cache_put(url, section, result["validators"])
+
+    def add_pdf(i, path, info):
+        log.info(f"  [pdf {i+1}] saved: {path}")
+        text = extract_pdf_text(path, pdf_pages)
+        if text:
+            add_section(text)
+        print(f"[SAVED] {info} -> {path}")
+
+    # PDFs are fetched over plain HTTP in parallel first; only the ones that
+    # fail (e.g. a redirect that needs the browser) are downloaded with Playwright
+    browser_pdfs = pdf_urls
+    if pdf_urls and httpx is not None:
+        browser_pdfs = []
+        with http_client() as client, \
+                ThreadPoolExecutor(max_workers=min(HTTP_PROBE_WORKERS, len(pdf_urls))) as pool:
+            downloads = list(pool.map(lambda u: download_pdf_http(client, u), pdf_urls))
+        for i, (url, (path, info)) in enumerate(zip(pdf_urls, downloads)):
+            log.info(f"[pdf {i+1}] downloading {url}")
+            if path:
+                add_pdf(i, path, info)
+            else:
+                log.info(f"  [pdf {i+1}] HTTP download failed ({info}), retrying in browser")
+                browser_pdfs.append(url)
+    over_http = len(static) + len(pdf_urls) - len(browser_pdfs)
+
+    # Only launch browser if we have uncached HTML or PDF URLs left
+    if uncached_html or browser_pdfs:
         with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True, args=BROWSER_ARGS)
-            context = browser.new_context(user_agent=UA, java_script_enabled=True,
-                                           accept_downloads=True)
+            context = open_context(p, accept_downloads=True)
+            context.add_init_script(script=EXTRACT_INIT_JS)
+            block_resources(context)
 
             # Handle PDF downloads first
-            for i, url in enumerate(pdf_urls):
+            for i, url in enumerate(browser_pdfs):
                 log.info(f"[pdf {i+1}] downloading {url}")
                 path, info = download_pdf_playwright(url, context)
                 if path:
-                    log.info(f"  [pdf {i+1}] saved: {path}")
-                    text = extract_pdf_text(path)
-                    if text:
-                        output_sections.append(text)
-                    print(f"[SAVED] {info} -> {path}")
+                    add_pdf(i, path, info)
                 else:
                     log.info(f"  [pdf {i+1}] FAILED: {info}")
 
-            # Open uncached HTML pages in parallel tabs
-            tabs = []
-            for i, url in enumerate(uncached_html):
-                log.info(f"[tab {i+1}] loading {url}")
-                page = context.new_page()
-                page.goto(url, wait_until="domcontentloaded", timeout=20000)
-                tabs.append((page, url))
-
-            # Extract from each tab
-            for i, (page, url) in enumerate(tabs):
+            # Load uncached HTML pages in a bounded set of parallel tabs
+            results = extract_tabs(context, uncached_html, extractor=extractor)
+            for i, (url, result) in enumerate(zip(uncached_html, results)):
+                if result is None:
+                    continue  # navigation failed, already logged
                 try:
-                    result = wait_and_extract(page, url)
                     title = result.get("title", url)
                     body = result.get("content", "")
                     if "Article unavailable" in title or "window[" in body[:200]:
                         log.info(f"  [{i+1}] SKIP: dead/broken ({title[:40]})")
                     elif body and len(body) > 50:
-                        section = "# " + title + "\nSource: " + url + "\n\n" + body
-                        output_sections.append(section)
+                        section = f"# {title}\nSource: {url}\n\n{body}"
+                        add_section(section)
                         if use_cache:
+                            # No validators: the navigation response's ETag belongs to the
+                            # SPA shell and would answer 304 however the article changes
                             cache_put(url, section)
                     else:
                         log.info(f"  [{i+1}] SKIP: too little content")
                 except Exception as e:
                     log.info(f"  [{i+1}] ERROR: {e}")
 
-            context.close()
-            browser.close()
-    elif cache_hits:
-        log.info(f"[cache] All {cache_hits} pages served from cache, no browser needed")
+            close_context(context)
+    else:
+        log.info(f"[cache] No browser needed ({cache_hits} cached, {over_http} over HTTP)")
 
     elapsed = time.time() - t0
 
-    if not output_sections:
+    if not returned:
         print("No relevant content found.")
     else:
-        print("\n\n---\n\n".join(output_sections))
+        out.write("\n")
+        sys.stdout.write(out.getvalue())
 
-    log.info(f"\n[done] {len(urls)} pages ({len(pdf_urls)} PDF, {len(html_urls)} HTML, {cache_hits} cached), {len(output_sections)} returned, {elapsed:.1f}s")
+    log.info(f"\n[done] {len(urls)} pages ({len(pdf_urls)} PDF, {len(html_urls)} HTML, {cache_hits} cached, {over_http} over HTTP), {returned} returned, {elapsed:.1f}s")
 
 
 def main():
@@ -642,14 +1327,39 @@ def main():
     parser.add_argument("--max-pages", "-m", type=int, default=10, help="Max pages to fetch (default 10)")
     parser.add_argument("--quiet", "-q", action="store_true", help="Suppress progress messages")
     parser.add_argument("--no-cache", action="store_true", help="Bypass cache, force fresh fetch")
+    parser.add_argument("--pages", default=None, metavar="RANGE",
+                        help="PDF pages to extract, e.g. 1-200 or 12 (default: first 20)")
+    parser.add_argument("--max-age", type=int, default=None, metavar="SECONDS",
+                        help="Revalidate cached pages older than this (default 1 day OLH, 7 days KB)")
     parser.add_argument("--topic", "-t", default=None, help="Topic keyword to look up in slug index")
     parser.add_argument("--check-cache", action="store_true", help="Check cached pages for content changes (launches browser)")
     parser.add_argument("--refresh", action="store_true", help="With --check-cache: auto-refresh stale pages")
+    parser.add_argument("--extractor", choices=EXTRACTORS, default=DEFAULT_EXTRACTOR,
+                        help="Markdown conversion in the page (js) or in Python via selectolax "
+                             f"(py; needs selectolax). Default: {DEFAULT_EXTRACTOR}")
+    parser.add_argument("--daemon", action="store_true", help="Start a background browser that later runs reuse")
+    parser.add_argument("--stop-daemon", action="store_true", help="Stop the background browser")
+    parser.add_argument("--serve-daemon", action="store_true", help=argparse.SUPPRESS)
     args = parser.parse_args()
     if args.quiet:
         log.setLevel(logging.WARNING)
+    if args.extractor == "py" and LexborHTMLParser is None:
+        parser.error("--extractor py needs selectolax (pip install selectolax)")
+    if args.pages and not _PAGE_SPEC_RE.match(args.pages):
+        parser.error("--pages takes a page number or range, e.g. 12 or 1-200")
+
+    if args.serve_daemon:
+        serve_daemon()
+        return
+    if args.daemon:
+        start_daemon()
+        return
+    if args.stop_daemon:
+        stop_daemon()
+        return
 
-    use_cache = not args.no_cache
+    batch_opts = {"use_cache": not args.no_cache, "max_age": args.max_age,
+                  "extractor": args.extractor, "pdf_pages": args.pages}
 
     # --check-cache mode: verify cached pages are still current
     if args.check_cache:
@@ -662,7 +1372,7 @@ def main():
         urls = resolve_topic(args.topic)
         if urls:
             log.info(f"[topic] '{args.topic}' -> {len(urls)} page(s)")
-            run_batch(urls, args.max_pages, use_cache=use_cache)
+            run_batch(urls, args.max_pages, **batch_opts)
         else:
             print(f"Topic '{args.topic}' not found in slug index. Known topics:")
             index = load_slug_index()
@@ -671,12 +1381,12 @@ def main():
             sys.exit(1)
     elif args.urls:
         url_list = [u.strip() for u in args.urls.split(",") if u.strip()]
-        run_batch(url_list, args.max_pages, use_cache=use_cache)
+        run_batch(url_list, args.max_pages, **batch_opts)
     elif args.query:
         if is_url(args.query):
-            run_batch([args.query], args.max_pages, use_cache=use_cache)
+            run_batch([args.query], args.max_pages, **batch_opts)
         elif is_slug(args.query):
-            run_batch([OLH_BASE + args.query], args.max_pages, use_cache=use_cache)
+            run_batch([OLH_BASE + args.query], args.max_pages, **batch_opts)
         else:
             parser.error("Query must be a URL or slug. Use WebSearch for discovery, then pass URLs here.")
     else:
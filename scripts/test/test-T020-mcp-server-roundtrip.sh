@@ -0,0 +1,81 @@
+#!/usr/bin/env bash
+# T020: super-manager servers.yaml add -> remove round trip leaves the file untouched,
+# including entries whose values span several lines and CRLF files with a key after servers:
+set -euo pipefail
+
+cd "$(git rev-parse --show-toplevel)"
+
+TMP=$(mktemp -d)
+trap 'rm -rf "$TMP"' EXIT
+FAIL=0
+
+# roundtrip <label> <servers.yaml to copy in>
+roundtrip() {
+  local home="$TMP/$1"
+  mkdir -p "$home/.claude/super-manager/registries"
+  cp "$2" "$home/.claude/super-manager/registries/servers.yaml"
+  HOME="$home" python3 - "$1" <<'EOF' || FAIL=1
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join("plugins", "super-manager", "skills", "super-manager"))
+from managers import mcp_server_manager as mcp
+
+label = sys.argv[1]
+path = os.path.join(os.environ["HOME"], ".claude", "super-manager", "registries", "servers.yaml")
+with open(path, "rb") as f:
+    before = f.read()
+crlf = b"\r\n" in before
+
+fail = 0
+cases = [
+    ("multi", "line one\n\nline three"),
+    ("quoted", "it's \"quoted\" \\ and\ttabbed"),
+    ("plain", "single line"),
+]
+for name, description in cases:
+    result = mcp.add_item(name, command="python", description=description, args=["-m", "x"])
+    if not result["success"]:
+        print("FAIL: {}: add {}: {}".format(label, name, result["message"]))
+        fail = 1
+        continue
+    with open(path, "rb") as f:
+        added = f.read()
+    if crlf and re.search(rb"(?<!\r)\n", added):
+        print("FAIL: {}: add of '{}' wrote LF-only lines into a CRLF file".format(label, name))
+        fail = 1
+    cfg = mcp.read_yaml_servers(path).get(name) or {}
+    if cfg.get("description") != description:
+        print("FAIL: {}: {} description read back as {!r}".format(label, name, cfg.get("description")))
+        fail = 1
+    mcp.remove_item(name)
+    with open(path, "rb") as f:
+        after = f.read()
+    if after != before:
+        print("FAIL: {}: add -> remove of '{}' changed servers.yaml:\n{}".format(label, name, after.decode()))
+        fail = 1
+
+if fail:
+    sys.exit(1)
+print("{}: servers.yaml add/remove round trip OK ({} entries)".format(label, len(cases)))
+EOF
+}
+
+cat > "$TMP/lf.yaml" <<'EOF'
+servers:
+  alpha:
+    command: npx
+    description: first server
+    enabled: true
+
+  omega:
+    command: node
+    enabled: false
+EOF
+
+roundtrip lf "$TMP/lf.yaml"
+# CRLF, with a defaults: key after servers: so new blocks are spliced in, not appended
+roundtrip bundled plugins/mcp-manager/skills/mcp-manager/servers.yaml
+
+exit "$FAIL"